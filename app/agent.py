@@ -140,6 +140,17 @@ class TravelPlannerAgent:
                 logger.warning("No budget estimate was generated, providing fallback")
                 output["estimated_budget"] = self._generate_fallback_budget(features)
             
+            if eval:
+                # Evaluation queries are independent, so they leave the conversation
+                # state untouched; a shared agent then neither grows nor mixes histories
+                eval_output = {
+                    "features": features,
+                    "queries": queries,
+                    "context": context,
+                    "output": output
+                }
+                return eval_output
+            
             # Store for later use
             self.last_itinerary = output.get("itinerary", "")
             self.last_features = features
@@ -153,15 +164,6 @@ class TravelPlannerAgent:
                 "role": "assistant",
                 "content": output.get("itinerary", "")
             })
-
-            if eval:
-                eval_output = {
-                    "features": features,
-                    "queries": queries,
-                    "context": context,
-                    "output": output
-                }
-                return eval_output
             
             return output
         
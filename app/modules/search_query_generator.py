@@ -8,13 +8,42 @@ Utilizes an LLM provider to generate contextually relevant queries for retrievin
 import re
 import json
 import logging
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Tuple, Union
 from api.llm_provider import LLMProvider
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = """
+You are a search query generator for a travel planning assistant.
+Your task is to create effective search queries based on extracted travel features.
+Generate search queries that will retrieve relevant information for each feature.
+
+Return a JSON array of objects, each containing:
+- "feature_type": The type of feature (place_to_visit, cuisine_preferences, place_preferences, transport_preferences)
+- "feature_value": The specific value of the feature
+- "search_query": An effective search query to get information about this feature
+
+For example:
+[
+  {
+    "feature_type": "place_to_visit",
+    "feature_value": "Paris",
+    "search_query": "Best time to visit Paris for tourists travel guide"
+  },
+  {
+    "feature_type": "cuisine_preferences",
+    "feature_value": "local food",
+    "search_query": "Most authentic local food restaurants in Paris for tourists"
+  }
+]
+
+Return only the JSON, with no additional text.
+"""
+
+# Keys every generated query object must carry
+_REQUIRED_KEYS = frozenset({"feature_type", "feature_value", "search_query"})
+
 class SearchQueryGenerator:
     """
     Generates targeted search queries based on extracted travel features.
@@ -26,7 +55,9 @@ class SearchQueryGenerator:
     Attributes:
         llm_provider (LLMProvider): The language model provider used to generate queries.
     """
-    
+
+    __slots__ = ("llm_provider",)
+
     def __init__(self, llm_provider: LLMProvider):
         """
         Initialize the Search Query Generator with an LLM provider.
@@ -61,39 +92,12 @@ class SearchQueryGenerator:
         """
         logger.info("Generating search queries based on extracted features")
         
-        system_prompt = """
-        You are a search query generator for a travel planning assistant.
-        Your task is to create effective search queries based on extracted travel features.
-        Generate search queries that will retrieve relevant information for each feature.
-        
-        Return a JSON array of objects, each containing:
-        - "feature_type": The type of feature (place_to_visit, cuisine_preferences, place_preferences, transport_preferences)
-        - "feature_value": The specific value of the feature
-        - "search_query": An effective search query to get information about this feature
-        
-        For example:
-        [
-          {
-            "feature_type": "place_to_visit",
-            "feature_value": "Paris",
-            "search_query": "Best time to visit Paris for tourists travel guide"
-          },
-          {
-            "feature_type": "cuisine_preferences",
-            "feature_value": "local food",
-            "search_query": "Most authentic local food restaurants in Paris for tourists"
-          }
-        ]
-        
-        Return only the JSON, with no additional text.
-        """
-        
-        # Format the features for the prompt
         place_to_visit = features.get('place_to_visit', '')
         if not place_to_visit:
             logger.warning("No destination specified in features")
             return self._generate_fallback_queries(features)
         
+        # Format the features for the prompt
         duration_days = features.get('duration_days')
         cuisine_preferences = features.get('cuisine_preferences', [])
         place_preferences = features.get('place_preferences', [])
@@ -115,11 +119,12 @@ class SearchQueryGenerator:
         try:
             logger.info("Sending query generation request to LLM")
             query_list = self.llm_provider.generate(
-                system_prompt=system_prompt,
+                system_prompt=SYSTEM_PROMPT,
                 user_prompt=user_prompt
             )
             
-            logger.info(f"Received LLM response: {query_list[:100]}...")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Received LLM response: %s...", query_list[:100])
             
             # Try to parse JSON
             try:
@@ -127,20 +132,21 @@ class SearchQueryGenerator:
                 
                 # Validate queries
                 if isinstance(queries, list) and all(
-                    isinstance(q, dict) and 
-                    "feature_type" in q and 
-                    "feature_value" in q and 
-                    "search_query" in q 
+                    isinstance(q, dict) and _REQUIRED_KEYS.issubset(q)
                     for q in queries
                 ):
-                    logger.info(f"Generated {len(queries)} search queries")
+                    logger.info("Generated %d search queries", len(queries))
                     return queries
                 else:
                     logger.warning("LLM returned invalid query list format")
                     return self._generate_fallback_queries(features)
             
             except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON: {e}", exc_info=True)
+                # Malformed LLM output is routine; only pay for tracebacks when debugging
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("JSON parse failed: %s", e, exc_info=True)
+                else:
+                    logger.warning("JSON parse failed: %s", e)
                 
                 # Try to extract JSON from the response (in case LLM added text)
                 json_pattern = r'(\[[\s\S]*\])'
@@ -150,13 +156,19 @@ class SearchQueryGenerator:
                     try:
                         logger.info("Attempting to extract JSON array from response")
                         return json.loads(match.group(1))
-                    except json.JSONDecodeError:
-                        logger.error("Failed to parse extracted JSON array", exc_info=True)
+                    except json.JSONDecodeError as e:
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Failed to parse extracted JSON array: %s", e, exc_info=True)
+                        else:
+                            logger.warning("Failed to parse extracted JSON array: %s", e)
                 
                 return self._generate_fallback_queries(features)
         
         except Exception as e:
-            logger.error(f"Error in query generation: {e}", exc_info=True)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Error in query generation: %s", e, exc_info=True)
+            else:
+                logger.warning("Error in query generation: %s", e)
             return self._generate_fallback_queries(features)
     
     def _generate_fallback_queries(self, features: Dict[str, Any]) -> List[Dict[str, str]]:
@@ -177,76 +189,119 @@ class SearchQueryGenerator:
         """
         logger.info("Using fallback query generation")
         
-        queries = []
-        place_to_visit = features.get('place_to_visit', '')
+        transport_preferences = features.get('transport_preferences') or ''
+        if isinstance(transport_preferences, list):
+            transport_preferences = tuple(transport_preferences)
         
+        # Cache key must be hashable, so list preferences are passed as tuples
+        args = (
+            features.get('place_to_visit') or '',
+            tuple(features.get('cuisine_preferences') or ()),
+            tuple(features.get('place_preferences') or ()),
+            transport_preferences
+        )
+        try:
+            fallback = self._fallback_tuple(*args)
+        except TypeError:
+            # Unhashable feature values (nested lists or dicts) are built without the cache
+            fallback = self._fallback_tuple.__wrapped__(*args)
+        
+        # Fresh dicts and lists so callers can mutate the queries without touching the cache
+        return [
+            {key: list(value) if isinstance(value, tuple) else value for key, value in query}
+            for query in fallback
+        ]
+    
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _fallback_tuple(place_to_visit: str,
+                        cuisine_preferences: Tuple[str, ...],
+                        place_preferences: Tuple[str, ...],
+                        transport_preferences: Union[str, Tuple[str, ...]]) -> Tuple[Tuple[Tuple[str, Any], ...], ...]:
+        """
+        Build the fallback query templates for a given set of features.
+        
+        Results are memoized per destination and preference combination, so repeated
+        fallbacks for the same trip skip re-rendering the query templates.
+        
+        Args:
+            place_to_visit (str): The travel destination, or an empty string.
+            cuisine_preferences (Tuple[str, ...]): Cuisine preferences, possibly empty.
+            place_preferences (Tuple[str, ...]): Place preferences, possibly empty.
+            transport_preferences (Union[str, Tuple[str, ...]]): Transport preference, or an empty string.
+            
+        Returns:
+            Tuple[Tuple[Tuple[str, Any], ...], ...]: Immutable query records, each a tuple
+                of (key, value) pairs that can be turned back into a dict. List
+                transport preferences are kept as tuples.
+        """
         if not place_to_visit:
-            return [
-                {
-                    "feature_type": "general",
-                    "feature_value": "travel",
-                    "search_query": "popular tourist destinations"
-                },
-                {
-                    "feature_type": "general",
-                    "feature_value": "travel planning",
-                    "search_query": "travel planning tips"
-                }
-            ]
+            return (
+                (
+                    ("feature_type", "general"),
+                    ("feature_value", "travel"),
+                    ("search_query", "popular tourist destinations")
+                ),
+                (
+                    ("feature_type", "general"),
+                    ("feature_value", "travel planning"),
+                    ("search_query", "travel planning tips")
+                )
+            )
+        
+        queries = []
         
         # Basic destination query
-        queries.append({
-            "feature_type": "place_to_visit",
-            "feature_value": place_to_visit,
-            "search_query": f"top attractions in {place_to_visit} tourist guide"
-        })
+        queries.append((
+            ("feature_type", "place_to_visit"),
+            ("feature_value", place_to_visit),
+            ("search_query", f"top attractions in {place_to_visit} tourist guide")
+        ))
         
         # Weather/best time query
-        queries.append({
-            "feature_type": "place_to_visit",
-            "feature_value": place_to_visit,
-            "search_query": f"best time to visit {place_to_visit} weather guide"
-        })
+        queries.append((
+            ("feature_type", "place_to_visit"),
+            ("feature_value", place_to_visit),
+            ("search_query", f"best time to visit {place_to_visit} weather guide")
+        ))
         
         # Transportation query
-        transport_preferences = features.get('transport_preferences', '')
         if transport_preferences:
-            queries.append({
-                "feature_type": "transport_preferences",
-                "feature_value": transport_preferences,
-                "search_query": f"{transport_preferences} options in {place_to_visit} for tourists"
-            })
+            # List preferences stay tuples in the cache but render as the original list
+            transport_label = list(transport_preferences) if isinstance(transport_preferences, tuple) else transport_preferences
+            queries.append((
+                ("feature_type", "transport_preferences"),
+                ("feature_value", transport_preferences),
+                ("search_query", f"{transport_label} options in {place_to_visit} for tourists")
+            ))
         else:
-            queries.append({
-                "feature_type": "transport_preferences",
-                "feature_value": "public transport",
-                "search_query": f"how to get around {place_to_visit} public transportation"
-            })
+            queries.append((
+                ("feature_type", "transport_preferences"),
+                ("feature_value", "public transport"),
+                ("search_query", f"how to get around {place_to_visit} public transportation")
+            ))
         
         # Cuisine preferences queries
-        cuisine_preferences = features.get('cuisine_preferences', [])
         if cuisine_preferences:
             for cuisine in cuisine_preferences:
-                queries.append({
-                    "feature_type": "cuisine_preferences",
-                    "feature_value": cuisine,
-                    "search_query": f"best {cuisine} in {place_to_visit} for tourists"
-                })
+                queries.append((
+                    ("feature_type", "cuisine_preferences"),
+                    ("feature_value", cuisine),
+                    ("search_query", f"best {cuisine} in {place_to_visit} for tourists")
+                ))
         else:
-            queries.append({
-                "feature_type": "cuisine_preferences",
-                "feature_value": "local food",
-                "search_query": f"must try local food in {place_to_visit} for tourists"
-            })
+            queries.append((
+                ("feature_type", "cuisine_preferences"),
+                ("feature_value", "local food"),
+                ("search_query", f"must try local food in {place_to_visit} for tourists")
+            ))
         
         # Place preferences queries
-        place_preferences = features.get('place_preferences', [])
-        if place_preferences:
-            for preference in place_preferences:
-                queries.append({
-                    "feature_type": "place_preferences",
-                    "feature_value": preference,
-                    "search_query": f"best {preference} in {place_to_visit} tourist guide"
-                })
-        
-        return queries
\ No newline at end of file
+        for preference in place_preferences:
+            queries.append((
+                ("feature_type", "place_preferences"),
+                ("feature_value", preference),
+                ("search_query", f"best {preference} in {place_to_visit} tourist guide")
+            ))
+        
+        return tuple(queries)
@@ -5,21 +5,214 @@ Travel Agent Evaluator module for comparing multiple LLM providers on travel pla
 Provides functionality to evaluate responses across multiple metrics and generate visualization reports.
 """
 
+import os
 import json
+import shelve
+import asyncio
+import hashlib
 import logging
+import threading
+import contextlib
 import numpy as np
-import pandas as pd
 from tqdm import tqdm
+import matplotlib
+# Plots are only written to files, so skip loading an interactive backend
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
-from typing import Dict, List, Any
+from functools import lru_cache, partial
+from typing import Dict, List, Any, Callable, Optional, Tuple, Union
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from app.agent import TravelPlannerAgent
 from api.llm_provider import LLMProvider
-from utils.helpers import set_to_list_converter
+from utils.helpers import json_dumps, json_dumpb, json_loads
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+JUDGE_SYSTEM_PROMPT = "You are an expert travel planner evaluator. You are judging the quality of an AI travel planning assistant."
+
+JUDGE_RESPONSE_TEMPLATE = """
+## Original User Query:
+"{query}"
+
+## Extracted Features:
+{features}
+
+## Generated Search Queries:
+{queries}
+
+## Collected Context:
+{context}
+
+## Generated Travel Plan:
+{output}
+
+"""
+
+JUDGE_FORMAT_EXAMPLE = """
+Provide your ratings as a JSON object with the metrics as keys and ratings as values (integers only).
+Then provide a brief explanation for each rating.
+
+Example format:
+{
+  "ratings": {
+    "accuracy": 8,
+    "relevance": 7,
+    ...
+  },
+  "explanations": {
+    "accuracy": "The plan accurately addresses...",
+    "relevance": "The recommendations are relevant because...",
+    ...
+  }
+}
+"""
+
+JUDGE_BATCH_FORMAT_EXAMPLE = """
+Provide your ratings for every travel plan as a single JSON object with a "results" list.
+Each entry must contain the plan's "id", its "ratings" with the metrics as keys and ratings
+as values (integers only), and a brief "explanations" entry for each rating.
+
+Example format:
+{
+  "results": [
+    {
+      "id": 1,
+      "ratings": {
+        "accuracy": 8,
+        "relevance": 7,
+        ...
+      },
+      "explanations": {
+        "accuracy": "The plan accurately addresses...",
+        "relevance": "The recommendations are relevant because...",
+        ...
+      }
+    },
+    ...
+  ]
+}
+"""
+
+_DECODER = json.JSONDecoder()
+
+@lru_cache(maxsize=None)
+def _get_agent(agent_config_json: str) -> TravelPlannerAgent:
+    """
+    Get a worker's travel planner agent for a configuration, building it on first use.
+    
+    Agents are memoized on their serialized config so a worker reuses one agent
+    across queries. Only pool workers call this, and the pool is shut down at
+    the end of each evaluation run, which releases the agents with it.
+    
+    Args:
+        agent_config_json (str): Agent configuration serialized with sorted keys
+        
+    Returns:
+        TravelPlannerAgent: The agent for this configuration
+    """
+    return TravelPlannerAgent(json.loads(agent_config_json))
+
+def _run_agent_in_worker(agent_config_json: str, query: str) -> Dict[str, Any]:
+    """
+    Process a query with a travel planner agent inside a worker process.
+    
+    Agents hold live LLM clients and cannot be pickled, so the worker builds
+    its own agent from the provider-specific config.
+    
+    Args:
+        agent_config_json (str): Agent configuration serialized with sorted keys
+        query (str): The user query to process
+        
+    Returns:
+        Dict[str, Any]: The agent's structured evaluation response
+    """
+    return _get_agent(agent_config_json).process_input(query, eval=True)
+
+def _run_agent_in_pool(pool: Executor, agent_config_json: str, query: str) -> Dict[str, Any]:
+    """
+    Submit a query to a process pool and wait for the agent's response.
+    
+    Args:
+        pool (Executor): Process pool running the agent calls
+        agent_config_json (str): Agent configuration serialized with sorted keys
+        query (str): The user query to process
+        
+    Returns:
+        Dict[str, Any]: The agent's structured evaluation response
+    """
+    return pool.submit(_run_agent_in_worker, agent_config_json, query).result()
+
+def _extract_first_json(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract the first valid JSON object embedded in a block of text.
+    
+    Walks forward from each opening brace and decodes in place, so surrounding
+    prose, code fences, or later brace-containing text do not break parsing.
+    
+    Args:
+        text (str): Text that may contain a JSON object
+        
+    Returns:
+        Optional[Dict[str, Any]]: The first decoded JSON object, or None if none is found
+    """
+    start = text.find('{')
+    while start >= 0:
+        try:
+            obj, _ = _DECODER.raw_decode(text, start)
+            return obj
+        except json.JSONDecodeError:
+            start = text.find('{', start + 1)
+    return None
+
+class _AsyncRateLimiter:
+    """
+    Token bucket limiting how many calls may start per second.
+    
+    Waiters are served in order; a limiter without a rate never blocks.
+    
+    Attributes:
+        rate (Optional[float]): Calls allowed per second, or None for no limit
+        capacity (float): Largest burst of calls allowed at once
+    """
+    
+    def __init__(self, rate: Optional[float], capacity: float = 1):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            rate (Optional[float]): Calls allowed per second, or None for no limit
+            capacity (float, optional): Largest burst of calls allowed at once. Defaults to 1.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = None
+        self._lock = asyncio.Lock()
+    
+    async def __aenter__(self) -> None:
+        if self.rate is None:
+            return
+        
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                # Refill the bucket for the time elapsed since the last call
+                now = loop.time()
+                if self._updated is not None:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
 class TravelAgentEvaluator:
     """
     Evaluates multiple LLM providers for the Travel Planning Agent.
@@ -38,6 +231,7 @@ class TravelAgentEvaluator:
         metrics (List): List of metrics used for evaluation
         scale_min (int): Minimum value on evaluation scale
         scale_max (int): Maximum value on evaluation scale
+        use_cache (bool): Whether agent responses and judge evaluations are cached on disk
         results (Dict): Storage for evaluation results
     """
     
@@ -75,75 +269,434 @@ class TravelAgentEvaluator:
             "accuracy", "relevance", "completeness", "usefulness", "creativity"
         ])
         
+        # Normalize metric definitions once into parallel id/name/description lists
+        self._metric_ids = []
+        self._metric_names = []
+        self._metric_descs = []
+        for metric in self.metrics:
+            if isinstance(metric, dict):
+                metric_id = metric.get("id", "")
+                self._metric_ids.append(metric_id)
+                self._metric_names.append(metric.get("name", metric_id.capitalize()))
+                self._metric_descs.append(metric.get("description", ""))
+            else:
+                # Handle legacy format where metrics might be simple strings
+                self._metric_ids.append(metric)
+                self._metric_names.append(metric.capitalize())
+                self._metric_descs.append(f"Rate how well the plan performs on {metric}")
+        
         # Scale for evaluation
         self.scale_min = self.evaluation_config.get("scale_min", 1)
         self.scale_max = self.evaluation_config.get("scale_max", 10)
         
+        # The judge prompt only varies by response, so build its scaffolding once
+        self._prompt_template = self._build_prompt_template()
+        self._batch_instructions = self._build_batch_instructions()
+        
+        # Every result is streamed to this JSONL log as it completes
+        self.log_file = self.evaluation_config.get("log_file", "eval_log.jsonl")
+        self._log_offset = None
+        
+        # Response cache so repeated evaluations skip redundant LLM calls
+        self.use_cache = self.evaluation_config.get("use_cache", False)
+        cache_dir = self.evaluation_config.get("cache_dir", "cache")
+        self._cache_path = os.path.join(cache_dir, "evaluation_cache")
+        self._cache_lock = threading.Lock()
+        if self.use_cache:
+            os.makedirs(cache_dir, exist_ok=True)
+        
         # Results storage
         self.results = {}
     
-    def evaluate_llm_providers(self, test_cases: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def evaluate_llm_providers(self, test_cases: List[Union[str, Dict[str, Any]]]) -> Dict[str, Any]:
         """
         Evaluate all LLM providers with the given test cases.
         
         Processes each test case through each LLM provider, collects responses,
-        and gets evaluations from the judge model. Handles errors gracefully
-        and maintains a structured record of all results.
+        and gets evaluations from the judge model. Agent and judge calls are
+        network-bound, so all provider/test case pairs are dispatched concurrently
+        (bounded by the ``max_concurrency`` evaluation setting). Handles errors
+        gracefully and maintains a structured record of all results.
+        
+        Each result is appended to the ``log_file`` JSONL log as soon as it is
+        judged, so only queries and evaluations are kept in memory.
         
         Args:
-            test_cases (List[Dict[str, Any]]): List of test cases with queries to process
+            test_cases (List[Union[str, Dict[str, Any]]]): Queries to process, either as plain
+                strings or as test case dicts with a "query" key
             
         Returns:
-            Dict[str, Any]: Complete evaluation results organized by provider
+            Dict[str, Any]: Evaluation results (queries and evaluations) organized by provider
+            
+        Raises:
+            RuntimeError: If called from a running event loop (e.g. in Jupyter), where
+                evaluate_llm_providers_async should be awaited instead
         """
-        logger.info("Evaluating LLM providers")
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.evaluate_llm_providers_async(test_cases))
         
-        results = {}
+        raise RuntimeError(
+            "evaluate_llm_providers() cannot run inside an active event loop; "
+            "use 'await evaluator.evaluate_llm_providers_async(test_cases)' instead"
+        )
+    
+    async def evaluate_llm_providers_async(self, test_cases: List[Union[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Evaluate all LLM providers with the given test cases from a running event loop.
+        
+        Runs every provider/test case pair concurrently and judges the responses.
+        Each successful response is queued for the judge as soon as its agent call
+        finishes and scored once ``judge_batch_size`` responses from the same
+        provider are waiting, so it is logged and freed without waiting on the
+        other agents. The LLM clients are synchronous, so each call runs on a
+        worker thread while the event loop bounds how many are in flight at once.
+        With ``agent_executor: process`` the agent calls are handed on to a
+        process pool to sidestep the GIL.
+        
+        Provider and judge LLM configs may set ``max_concurrent`` to cap their
+        calls in flight and ``requests_per_second`` to throttle how fast new
+        calls start. Results are written to the JSONL log from the
+        event loop as each one becomes final.
         
-        # For each LLM provider
-        for provider_name, provider_config in tqdm(self.llm_providers.items(), desc="Evaluating LLM providers"):
-            logger.info(f"Evaluating provider: {provider_name}")
+        Args:
+            test_cases (List[Union[str, Dict[str, Any]]]): Queries to process, either as plain
+                strings or as test case dicts with a "query" key
             
+        Returns:
+            Dict[str, Any]: Evaluation results (queries and evaluations) organized by provider
+        """
+        logger.info("Evaluating LLM providers")
+        
+        max_concurrency = self.evaluation_config.get("max_concurrency", 8)
+        batch_size = max(1, self.evaluation_config.get("judge_batch_size", 1))
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        # Each provider (and the judge) gets its own concurrency cap and request rate,
+        # so a slow or rate-limited provider does not hold back the others
+        provider_limits = {
+            provider_name: (
+                asyncio.Semaphore(provider_config.get("max_concurrent", max_concurrency)),
+                _AsyncRateLimiter(provider_config.get("requests_per_second"))
+            )
+            for provider_name, provider_config in self.llm_providers.items()
+        }
+        judge_limits = (
+            asyncio.Semaphore(self.judge_llm_config.get("max_concurrent", max_concurrency)),
+            _AsyncRateLimiter(self.judge_llm_config.get("requests_per_second"))
+        )
+        loop = asyncio.get_running_loop()
+        
+        # LLMProvider has no async API, so agent calls run on threads by default.
+        # Agents doing CPU-heavy local work can run in worker processes instead.
+        use_processes = self.evaluation_config.get("agent_executor", "thread") == "process"
+        
+        agent_configs = {}
+        for provider_name, provider_config in self.llm_providers.items():
             # Clone the config but replace the LLM provider
             provider_specific_config = self.config.copy()
             provider_specific_config["llm"] = provider_config
+            # Serialized with sorted keys so it doubles as the agent cache key
+            agent_configs[provider_name] = json.dumps(provider_specific_config, sort_keys=True)
+        
+        queries = [test_case if isinstance(test_case, str) else test_case["query"] for test_case in test_cases]
+        jobs = [
+            (provider_name, query)
+            for provider_name in agent_configs
+            for query in queries
+        ]
+        
+        # Compact per-job results; full responses only live in the JSONL log
+        compact_results = [None] * len(jobs)
+        
+        agent_pool = (
+            ProcessPoolExecutor(max_workers=self.evaluation_config.get("agent_workers", os.cpu_count()))
+            if use_processes else contextlib.nullcontext()
+        )
+        
+        with open(self.log_file, "a") as log_file, agent_pool, \
+                ThreadPoolExecutor(max_workers=max_concurrency) as executor, \
+                tqdm(total=2 * len(jobs), desc="Evaluating LLM providers") as progress:
+            
+            # Initialize one agent runner per provider
+            if use_processes:
+                run_agents = {
+                    provider_name: partial(_run_agent_in_pool, agent_pool, agent_config)
+                    for provider_name, agent_config in agent_configs.items()
+                }
+            else:
+                # Fresh agents for this run, released once it finishes
+                run_agents = {
+                    provider_name: partial(TravelPlannerAgent(json.loads(agent_config)).process_input, eval=True)
+                    for provider_name, agent_config in agent_configs.items()
+                }
             
-            # Initialize agent with this provider
-            agent = TravelPlannerAgent(provider_specific_config)
+            # Remember where this run starts so the report can read back only its entries
+            self._log_offset = log_file.tell()
             
-            provider_results = []
+            # Successful agent responses waiting for the judge, keyed by job index.
+            # Judge batches are formed per provider so each prompt compares like with like.
+            responses = {}
+            pending = {provider_name: [] for provider_name in agent_configs}
+            agents_left = len(jobs)
             
-            # For each test case
-            for test_case in tqdm(test_cases, desc=f"Testing {provider_name}", leave=False):
-                query = test_case["query"]
+            def _record(i: int, evaluation: Any) -> None:
+                provider_name, query = jobs[i]
                 
-                try:
-                    # Process the query
-                    response = agent.process_input(query, eval=True)                    
-                    # Get the judge's evaluation
-                    evaluation = self.judge_response(query, response, provider_name)
-                    
-                    # Store the results
+                if isinstance(evaluation, BaseException):
+                    logger.error(f"Error evaluating {provider_name} on query '{query}': {str(evaluation)}")
+                    test_result = {
+                        "query": query,
+                        "error": str(evaluation)
+                    }
+                    log_entry = test_result
+                else:
                     test_result = {
                         "query": query,
-                        "response": response,
                         "evaluation": evaluation
                     }
-                    
-                    provider_results.append(test_result)
-                    
-                except Exception as e:
-                    logger.error(f"Error evaluating {provider_name} on query '{query}': {str(e)}")
-                    provider_results.append({
+                    log_entry = {
                         "query": query,
-                        "error": str(e)
-                    })
+                        "response": responses.get(i),
+                        "evaluation": evaluation
+                    }
+                
+                # Write each result as soon as it is final so it survives a later crash,
+                # then drop the response from memory
+                compact_results[i] = test_result
+                log_file.write(json_dumps({"provider": provider_name, "index": i, **log_entry}) + "\n")
+                log_file.flush()
+                responses.pop(i, None)
+            
+            async def _judge_batch(batch: List[int]) -> None:
+                items = [(jobs[i][1], responses[i], jobs[i][0]) for i in batch]
+                judge_limit, judge_rate = judge_limits
+                async with judge_limit, judge_rate, semaphore:
+                    try:
+                        if len(items) == 1:
+                            evaluations = [await loop.run_in_executor(executor, self.judge_response, *items[0])]
+                        else:
+                            evaluations = await loop.run_in_executor(executor, self.judge_response_batch, items)
+                    except Exception as e:
+                        evaluations = [e] * len(batch)
+                    finally:
+                        progress.update(len(batch))
+                
+                for i, evaluation in zip(batch, evaluations):
+                    _record(i, evaluation)
+            
+            async def _run_one(i: int) -> None:
+                nonlocal agents_left
+                provider_name, query = jobs[i]
+                provider_limit, provider_rate = provider_limits[provider_name]
+                async with provider_limit, provider_rate, semaphore:
+                    try:
+                        responses[i] = await loop.run_in_executor(
+                            executor, self._process_query,
+                            provider_name, agent_configs[provider_name], run_agents[provider_name], query
+                        )
+                        pending[provider_name].append(i)
+                    except Exception as e:
+                        _record(i, e)
+                        # Failed queries skip the judge
+                        progress.update(1)
+                    finally:
+                        progress.update(1)
+                        agents_left -= 1
+                
+                # Judge as soon as a provider's batch fills up, and flush partial batches
+                # once every agent is done
+                for provider_pending in ([pending[provider_name]] if agents_left else pending.values()):
+                    while provider_pending and (len(provider_pending) >= batch_size or agents_left == 0):
+                        batch = provider_pending[:batch_size]
+                        del provider_pending[:batch_size]
+                        await _judge_batch(batch)
             
-            results[provider_name] = provider_results
+            # Process every query with every provider, judging each response as it arrives
+            await asyncio.gather(*(_run_one(i) for i in range(len(jobs))))
+        
+        results = {provider_name: [] for provider_name in agent_configs}
+        for (provider_name, _), test_result in zip(jobs, compact_results):
+            results[provider_name].append(test_result)
         
         self.results = results
         return results
     
+    def _process_query(self, provider_name: str, agent_config: str,
+                       run_agent: Callable[[str], Dict[str, Any]], query: str) -> Dict[str, Any]:
+        """
+        Process a query with a provider's agent, reusing a cached response if available.
+        
+        Responses are keyed on the full agent configuration and the query, so reruns
+        of the same evaluation do not call the provider again. Only complete
+        responses are cached; agent fallback responses are always recomputed.
+        
+        Args:
+            provider_name (str): Name of the LLM provider being evaluated
+            agent_config (str): Provider-specific agent configuration serialized with sorted keys
+            run_agent (Callable[[str], Dict[str, Any]]): Runs this provider's agent on a query
+            query (str): The user query to process
+            
+        Returns:
+            Dict[str, Any]: The agent's structured evaluation response
+        """
+        cache_key = self._cache_key("agent", provider_name, agent_config, query)
+        
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached response from provider: {provider_name}")
+            return cached
+        
+        response = run_agent(query)
+        if "output" in response:
+            self._cache_store(cache_key, response)
+        
+        return response
+    
+    def _cache_key(self, *parts: str) -> str:
+        """
+        Build a cache key from the given string parts.
+        
+        Args:
+            *parts (str): Strings that together identify a cached entry
+            
+        Returns:
+            str: A BLAKE2b hex digest of the joined parts
+        """
+        return hashlib.blake2b("\x1f".join(parts).encode()).hexdigest()
+    
+    def _cache_lookup(self, key: str) -> Any:
+        """
+        Look up a value in the on-disk evaluation cache.
+        
+        Args:
+            key (str): The cache key
+            
+        Returns:
+            Any: The cached value, or None on a miss or if caching is disabled
+        """
+        if not self.use_cache:
+            return None
+        
+        try:
+            with self._cache_lock, shelve.open(self._cache_path) as cache:
+                return cache.get(key)
+        except Exception as e:
+            logger.error(f"Error reading from evaluation cache: {e}")
+            return None
+    
+    def _cache_store(self, key: str, value: Any) -> None:
+        """
+        Store a value in the on-disk evaluation cache.
+        
+        Args:
+            key (str): The cache key
+            value (Any): The value to cache (must be picklable)
+        """
+        if not self.use_cache:
+            return
+        
+        try:
+            with self._cache_lock, shelve.open(self._cache_path) as cache:
+                cache[key] = value
+        except Exception as e:
+            logger.error(f"Error saving to evaluation cache: {e}")
+    
+    def _build_metric_descriptions(self) -> str:
+        """
+        Render the configured metrics as a bulleted list for the judge prompt.
+        
+        Returns:
+            str: One bullet per metric with its name and description
+        """
+        return "".join(
+            f"- {metric_name}: {metric_desc}\n\n"
+            for metric_name, metric_desc in zip(self._metric_names, self._metric_descs)
+        )
+    
+    def _build_prompt_template(self) -> str:
+        """
+        Build the judge prompt template from the configured metrics and scale.
+        
+        Everything except the response components is fixed for the lifetime of
+        the evaluator, so it is rendered once here. The returned template has
+        ``query``, ``features``, ``queries``, ``context`` and ``output`` fields
+        to be filled in with ``str.format``.
+        
+        Returns:
+            str: The judge prompt template
+        """
+        instructions = f"""Please evaluate the generated travel plan based on Original User Query, Extracted Features,\\
+Generated Search Queries, Collected Context using the following metrics, \\
+on a scale from {self.scale_min} (worst) to {self.scale_max} (best):
+
+"""
+        # Escape literal braces so only the response fields are formatted later
+        static_text = instructions + self._build_metric_descriptions() + JUDGE_FORMAT_EXAMPLE
+        return JUDGE_RESPONSE_TEMPLATE + static_text.replace("{", "{{").replace("}", "}}")
+    
+    def _build_batch_instructions(self) -> str:
+        """
+        Build the static instructions that open every batched judge prompt.
+        
+        Keeping this header identical across batches lets providers that cache
+        prompt prefixes skip re-processing it.
+        
+        Returns:
+            str: The batch judging instructions, metric descriptions and format example
+        """
+        instructions = f"""You will evaluate several travel plans, each generated for an independent user query.
+Please evaluate each generated travel plan based on its Original User Query, Extracted Features,
+Generated Search Queries, Collected Context using the following metrics,
+on a scale from {self.scale_min} (worst) to {self.scale_max} (best):
+
+"""
+        return instructions + self._build_metric_descriptions() + JUDGE_BATCH_FORMAT_EXAMPLE
+    
+    def _serialize_response(self, response: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Serialize the components of an agent response for the judge prompt.
+        
+        Args:
+            response (Dict[str, Any]): The agent's structured response
+            
+        Returns:
+            Dict[str, str]: JSON strings for the features, queries, context and output
+        """
+        return {
+            "features": json_dumps(response["features"], indent=True),
+            "queries": json_dumps(response["queries"], indent=True),
+            "context": json_dumps(response["context"], indent=True),
+            "output": json_dumps(response["output"], indent=True)
+        }
+    
+    def _quick_reject(self, response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Rate degenerate agent responses without calling the judge.
+        
+        A response that reports an error or carries no travel plan cannot score
+        above the bottom of the scale, so it is given the minimum rating directly.
+        
+        Args:
+            response (Dict[str, Any]): The agent's structured response
+            
+        Returns:
+            Optional[Dict[str, Any]]: Minimum ratings with explanations, or None if
+                the response needs to be judged
+        """
+        if response.get("error"):
+            reason = f"The agent reported an error: {response['error']}"
+        elif not response.get("output"):
+            reason = "The agent did not produce a travel plan."
+        else:
+            return None
+        
+        return {
+            "ratings": {metric_id: self.scale_min for metric_id in self._metric_ids},
+            "explanations": {metric_id: reason for metric_id in self._metric_ids}
+        }
+    
     def judge_response(self, query: str, response: Dict[str, Any], provider_name: str) -> Dict[str, Any]:
         """
         Use the judge LLM to evaluate a response.
@@ -162,68 +715,29 @@ class TravelAgentEvaluator:
         """
         logger.info(f"Judging response from provider: {provider_name}")
 
+        # Degenerate responses get the minimum rating without a judge call
+        rejected = self._quick_reject(response)
+        if rejected is not None:
+            logger.info(f"Skipping judge for degenerate response from provider: {provider_name}")
+            return rejected
+
         # Extract components from the response
-        features = json.dumps(response["features"], indent=2)
-        queries = json.dumps(response["queries"], indent=2)
-        context = json.dumps(response["context"], indent=2, default=set_to_list_converter)
-        output = json.dumps(response["output"], indent=2)
+        components = self._serialize_response(response)
 
-        system_prompt = "You are an expert travel planner evaluator. You are judging the quality of an AI travel planning assistant."
+        system_prompt = JUDGE_SYSTEM_PROMPT
         
-        # Construct prompt for the judge with dynamically loaded metric descriptions
-        prompt = f"""
-## Original User Query:
-"{query}"
-
-## Extracted Features:
-{features}
-
-## Generated Search Queries:
-{queries}
-
-## Collected Context:
-{context}
-
-## Generated Travel Plan:
-{output}
-
-Please evaluate the generated travel plan based on Original User Query, Extracted Features,\\
-Generated Search Queries, Collected Context using the following metrics, \\
-on a scale from {self.scale_min} (worst) to {self.scale_max} (best):
-
-"""
-        # Dynamically add metric descriptions from config
-        for metric in self.metrics:
-            if isinstance(metric, dict):
-                metric_id = metric.get("id", "")
-                metric_name = metric.get("name", metric_id.capitalize())
-                metric_desc = metric.get("description", "")
-                prompt += f"- {metric_name}: {metric_desc}\n\n"
-            else:
-                # Handle legacy format where metrics might be simple strings
-                prompt += f"- {metric.capitalize()}: Rate how well the plan performs on {metric}\n\n"
+        # Fill the precomputed prompt template with this response's components
+        prompt = self._prompt_template.format(query=query, **components)
         
-        prompt += """
-Provide your ratings as a JSON object with the metrics as keys and ratings as values (integers only).
-Then provide a brief explanation for each rating.
-
-Example format:
-{
-  "ratings": {
-    "accuracy": 8,
-    "relevance": 7,
-    ...
-  },
-  "explanations": {
-    "accuracy": "The plan accurately addresses...",
-    "relevance": "The recommendations are relevant because...",
-    ...
-  }
-}
-"""
         logger.info("Rating Prompt------------")
         logger.info(prompt)
         
+        cache_key = self._cache_key("judge", system_prompt, prompt)
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached evaluation for provider: {provider_name}")
+            return cached
+        
         try:
             # Call the judge LLM
             response = self.judge_llm.generate(
@@ -234,12 +748,12 @@ Example format:
             logger.info(response)
             
             # Extract the JSON from the response
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
+            evaluation = _extract_first_json(response)
             
-            if json_start >= 0 and json_end > 0:
-                json_str = response[json_start:json_end]
-                evaluation = json.loads(json_str)
+            if evaluation is not None:
+                # Only cache complete evaluations so malformed replies are retried
+                if "ratings" in evaluation:
+                    self._cache_store(cache_key, evaluation)
                 
                 return evaluation
             else:
@@ -250,6 +764,101 @@ Example format:
             logger.error(f"Error in judge_response: {str(e)}")
             return {"error": str(e)}
     
+    def judge_response_batch(self, items: List[Tuple[str, Dict[str, Any], str]]) -> List[Dict[str, Any]]:
+        """
+        Use the judge LLM to evaluate several responses in a single call.
+        
+        All responses are placed in one prompt after a shared instruction header,
+        and the judge returns one rating object per response. This avoids resending
+        the instructions and metric descriptions for every response.
+        
+        Args:
+            items (List[Tuple[str, Dict[str, Any], str]]): (query, response, provider_name)
+                tuples to evaluate together
+            
+        Returns:
+            List[Dict[str, Any]]: Evaluation metrics with ratings and explanations for
+                each item, in input order. Items the judge did not rate carry an error.
+        """
+        logger.info(f"Judging a batch of {len(items)} responses")
+        
+        evaluations = [None] * len(items)
+        sections = []
+        batch_ids = []
+        
+        for i, (query, response, provider_name) in enumerate(items):
+            rejected = self._quick_reject(response)
+            if rejected is not None:
+                logger.info(f"Skipping judge for degenerate response from provider: {provider_name}")
+                evaluations[i] = rejected
+                continue
+            
+            try:
+                components = self._serialize_response(response)
+            except Exception as e:
+                logger.error(f"Error preparing response from {provider_name} for judging: {str(e)}")
+                evaluations[i] = {"error": str(e)}
+                continue
+            
+            batch_ids.append(i)
+            sections.append(
+                f"\n# Travel Plan {len(batch_ids)}\n" + JUDGE_RESPONSE_TEMPLATE.format(query=query, **components)
+            )
+        
+        if not batch_ids:
+            return evaluations
+        
+        prompt = self._batch_instructions + "".join(sections)
+        
+        cache_key = self._cache_key("judge_batch", JUDGE_SYSTEM_PROMPT, prompt)
+        cached = self._cache_lookup(cache_key)
+        
+        if cached is not None:
+            logger.info("Using cached evaluations for judge batch")
+            batch_results = cached
+        else:
+            batch_results = {}
+            try:
+                # Call the judge LLM
+                reply = self.judge_llm.generate(
+                    user_prompt=prompt,
+                    system_prompt=JUDGE_SYSTEM_PROMPT
+                )
+                
+                logger.info(reply)
+                
+                parsed = _extract_first_json(reply) or {}
+                for result in parsed.get("results", []):
+                    if isinstance(result, dict) and "ratings" in result:
+                        # Judges sometimes echo ids as strings
+                        try:
+                            plan_id = int(result.get("id"))
+                        except (TypeError, ValueError):
+                            continue
+                        batch_results[plan_id] = {
+                            "ratings": result["ratings"],
+                            "explanations": result.get("explanations", {})
+                        }
+                
+                # Only cache complete batches so partial replies are retried
+                if len(batch_results) == len(batch_ids):
+                    self._cache_store(cache_key, batch_results)
+                
+            except Exception as e:
+                logger.error(f"Error in judge_response_batch: {str(e)}")
+                for i in batch_ids:
+                    evaluations[i] = {"error": str(e)}
+                return evaluations
+        
+        for plan_id, i in enumerate(batch_ids, start=1):
+            evaluation = batch_results.get(plan_id)
+            if evaluation is None:
+                logger.warning(f"Judge response did not include travel plan {plan_id}")
+                evaluation = {"error": "Failed to parse judge response"}
+            evaluations[i] = evaluation
+        
+        return evaluations
+    
     def generate_report(self, output_file: str = None) -> Dict[str, Any]:
         """
         Generate a report from the evaluation results.
@@ -273,27 +882,28 @@ Example format:
         # Calculate average scores for each provider and metric
         summary = {}
         
+        metric_ids = self._metric_ids
+        
         for provider, results in self.results.items():
-            provider_scores = {metric.get("id"): [] for metric in self.metrics}
+            # Stage ratings into a (test cases x metrics) array; missing ratings stay NaN
+            scores = np.full((len(results), len(metric_ids)), np.nan, dtype=np.float32)
             
-            for result in results:
+            for i, result in enumerate(results):
                 if "evaluation" in result and "ratings" in result["evaluation"]:
                     ratings = result["evaluation"]["ratings"]
-                    for metric in self.metrics:
-                        metric_name = metric.get("id")
-                        if metric_name in ratings:
-                            provider_scores[metric_name].append(ratings[metric_name])
+                    for j, metric_id in enumerate(metric_ids):
+                        scores[i, j] = ratings.get(metric_id, np.nan)
             
-            # Calculate averages
-            provider_averages = {
-                metric: sum(scores) / len(scores) if scores else 0 
-                for metric, scores in provider_scores.items()
-            }
+            # Calculate averages, treating metrics without any ratings as 0
+            counts = np.count_nonzero(~np.isnan(scores), axis=0)
+            totals = np.nansum(scores, axis=0, dtype=np.float64)
+            means = np.where(counts > 0, totals / np.maximum(counts, 1), 0.0)
+            
+            provider_averages = dict(zip(metric_ids, means.tolist()))
             
             # Add overall average
-            if provider_scores:
-                overall = sum(provider_averages.values()) / len(provider_averages)
-                provider_averages["overall"] = overall
+            if metric_ids:
+                provider_averages["overall"] = float(means.mean())
             
             summary[provider] = provider_averages
         
@@ -302,11 +912,13 @@ Example format:
             output_path = output_file or self.evaluation_config.get("output_file", "evaluation_results.json")
             
             try:
-                with open(output_path, 'w') as f:
-                    json.dump({
+                detailed_results = self._load_detailed_results()
+                
+                with open(output_path, 'wb') as f:
+                    f.write(json_dumpb({
                         "summary": summary,
-                        "detailed_results": self.results
-                    }, f, indent=2, default=set_to_list_converter)
+                        "detailed_results": detailed_results
+                    }, indent=True))
                 
                 logger.info(f"Results saved to {output_path}")
             except Exception as e:
@@ -314,6 +926,32 @@ Example format:
         
         return summary
     
+    def _load_detailed_results(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Rebuild the full results of the last run, including agent responses.
+        
+        In-memory results only keep ratings, so the responses are read back
+        from this run's section of the JSONL log.
+        
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Full results organized by provider, in test case order
+        """
+        if self._log_offset is None:
+            return self.results
+        
+        detailed_results = {provider_name: [] for provider_name in self.results}
+        
+        with open(self.log_file, 'r') as f:
+            f.seek(self._log_offset)
+            entries = [json_loads(line) for line in f]
+        
+        # Entries are logged in completion order, so restore test case order
+        entries.sort(key=lambda entry: entry.pop("index"))
+        for entry in entries:
+            detailed_results.setdefault(entry.pop("provider"), []).append(entry)
+        
+        return detailed_results
+    
     def plot_results(self, summary: Dict[str, Dict[str, float]] = None) -> None:
         """
         Plot the evaluation results.
@@ -337,29 +975,24 @@ Example format:
             # Generate summary if not provided
             summary = self.generate_report()
         
-        # Create dataframe from summary
-        data = []
-        
-        for provider, metrics in summary.items():
-            for metric, score in metrics.items():
-                data.append({
-                    "Provider": provider,
-                    "Metric": metric,
-                    "Score": score
-                })
-        
-        df = pd.DataFrame(data)
+        # Lay the summary out as a dense (providers x metrics) score matrix
+        providers = list(summary.keys())
+        score_matrix = np.array(
+            [[summary[provider].get(metric_id, 0) for metric_id in self._metric_ids] for provider in providers],
+            dtype=float
+        ).reshape(len(providers), len(self._metric_ids))
+        overall = np.array([summary[provider].get("overall", 0) for provider in providers], dtype=float)
         
         # Plot 1: Overall comparison
-        self._plot_overall_comparison(df)
+        self._plot_overall_comparison(providers, overall)
         
         # Plot 2: Metrics comparison across providers
-        self._plot_metrics_comparison(df)
+        self._plot_metrics_comparison(score_matrix, providers)
         
         # Plot 3: Radar chart per provider
-        self._plot_radar_charts(df)
+        self._plot_radar_charts(score_matrix, providers)
     
-    def _plot_overall_comparison(self, df: pd.DataFrame) -> None:
+    def _plot_overall_comparison(self, providers: List[str], overall: np.ndarray) -> None:
         """
         Plot overall comparison of providers.
         
@@ -367,38 +1000,36 @@ Example format:
         sorted in descending order of performance.
         
         Args:
-            df (pd.DataFrame): DataFrame containing the evaluation data
-                with Provider, Metric, and Score columns
+            providers (List[str]): Provider names
+            overall (np.ndarray): Overall score of each provider, in providers order
         """
-        plt.figure(figsize=(12, 6))
-        
-        # Filter for overall metric
-        overall_df = df[df["Metric"] == "overall"]
+        fig, ax = plt.subplots(figsize=(12, 6))
         
         # Sort by score descending
-        overall_df = overall_df.sort_values("Score", ascending=False)
+        order = np.argsort(-overall, kind="stable")
         
         # Create bar chart
-        bars = plt.bar(overall_df["Provider"], overall_df["Score"])
+        bars = ax.bar([providers[i] for i in order], overall[order])
         
         # Add score labels on top of bars
         for bar in bars:
             height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+            ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
                     f'{height:.2f}', ha='center', va='bottom')
         
-        plt.xlabel("LLM Provider")
-        plt.ylabel("Overall Score")
-        plt.title("Overall Performance Comparison of LLM Providers")
-        plt.ylim(0, self.scale_max + 0.5)  # Add some space for labels
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        plt.tight_layout()
+        ax.set_xlabel("LLM Provider")
+        ax.set_ylabel("Overall Score")
+        ax.set_title("Overall Performance Comparison of LLM Providers")
+        ax.set_ylim(0, self.scale_max + 0.5)  # Add some space for labels
+        ax.grid(axis='y', linestyle='--', alpha=0.7)
+        fig.tight_layout()
         
-        # Save plot
-        plt.savefig("overall_comparison.png")
+        # Save plot and release the figure
+        fig.savefig("overall_comparison.png")
+        plt.close(fig)
         logger.info("Saved overall comparison plot to overall_comparison.png")
     
-    def _plot_metrics_comparison(self, df: pd.DataFrame) -> None:
+    def _plot_metrics_comparison(self, score_matrix: np.ndarray, providers: List[str]) -> None:
         """
         Plot metrics comparison across providers.
         
@@ -406,44 +1037,35 @@ Example format:
         performs across different evaluation metrics.
         
         Args:
-            df (pd.DataFrame): DataFrame containing the evaluation data
-                with Provider, Metric, and Score columns
+            score_matrix (np.ndarray): Scores with one row per provider and
+                one column per metric
+            providers (List[str]): Provider names, in score_matrix row order
         """
-        plt.figure(figsize=(15, 8))
-        
-        # Filter out overall metric
-        df_metrics = df[df["Metric"] != "overall"]
+        fig, ax = plt.subplots(figsize=(15, 8))
         
         # Create grouped bar chart
-        providers = df_metrics["Provider"].unique()
-        metrics = [metric.get("id") for metric in self.metrics]
-        
-        x = np.arange(len(metrics))
+        x = np.arange(len(self._metric_ids))
         width = 0.8 / len(providers)
+        offsets = (np.arange(len(providers)) - (len(providers) - 1) / 2) * width
         
         for i, provider in enumerate(providers):
-            provider_data = df_metrics[df_metrics["Provider"] == provider]
-            scores = [provider_data[provider_data["Metric"] == metric]["Score"].values[0] 
-                    if not provider_data[provider_data["Metric"] == metric].empty else 0 
-                    for metric in metrics]
-            
-            offset = i * width - (len(providers) - 1) * width / 2
-            plt.bar(x + offset, scores, width, label=provider)
-        
-        plt.xlabel("Metrics")
-        plt.ylabel("Score")
-        plt.title("Performance Comparison Across Metrics")
-        plt.xticks(x, [m.capitalize() for m in metrics], rotation=45)
-        plt.ylim(0, self.scale_max + 0.5)
-        plt.legend(title="LLM Provider")
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        plt.tight_layout()
-        
-        # Save plot
-        plt.savefig("metrics_comparison.png")
+            ax.bar(x + offsets[i], score_matrix[i], width, label=provider)
+        
+        ax.set_xlabel("Metrics")
+        ax.set_ylabel("Score")
+        ax.set_title("Performance Comparison Across Metrics")
+        ax.set_xticks(x, [m.capitalize() for m in self._metric_ids], rotation=45)
+        ax.set_ylim(0, self.scale_max + 0.5)
+        ax.legend(title="LLM Provider")
+        ax.grid(axis='y', linestyle='--', alpha=0.7)
+        fig.tight_layout()
+        
+        # Save plot and release the figure
+        fig.savefig("metrics_comparison.png")
+        plt.close(fig)
         logger.info("Saved metrics comparison plot to metrics_comparison.png")
     
-    def _plot_radar_charts(self, df: pd.DataFrame) -> None:
+    def _plot_radar_charts(self, score_matrix: np.ndarray, providers: List[str]) -> None:
         """
         Plot radar charts for each provider.
         
@@ -451,47 +1073,33 @@ Example format:
         performance profile of each provider across all metrics.
         
         Args:
-            df (pd.DataFrame): DataFrame containing the evaluation data
-                with Provider, Metric, and Score columns
+            score_matrix (np.ndarray): Scores with one row per provider and
+                one column per metric
+            providers (List[str]): Provider names, in score_matrix row order
         """
-        # Filter out overall metric
-        df_metrics = df[df["Metric"] != "overall"]
-        
-        # Get unique providers
-        providers = df_metrics["Provider"].unique()
-        
         # Create subplots - one radar chart per provider
         n_rows = (len(providers) + 1) // 2
         fig, axes = plt.subplots(n_rows, 2, figsize=(15, 5 * n_rows),
                                 subplot_kw=dict(polar=True))
         axes = axes.flatten()
         
+        # Axis layout is the same for every provider, so compute it once
+        labels = [m.capitalize() for m in self._metric_ids]
+        angles = np.linspace(0, 2 * np.pi, len(labels) + 1, endpoint=True)
+        deg_ticks = angles[:-1] * 180 / np.pi
+        
+        # Close the loop by repeating each provider's first score
+        closed_scores = np.hstack([score_matrix, score_matrix[:, :1]])
+        
         # For each provider
         for i, provider in enumerate(providers):
             if i < len(axes):
                 ax = axes[i]
                 
-                # Get provider data
-                provider_data = df_metrics[df_metrics["Provider"] == provider]
-                
-                # Prepare data for radar chart
-                metrics = {metric.get("id"): [] for metric in self.metrics}
-                scores = []
-                
-                for metric in metrics:
-                    metric_score = provider_data[provider_data["Metric"] == metric]["Score"]
-                    scores.append(metric_score.values[0] if not metric_score.empty else 0)
-                
-                # Close the loop
-                metrics = [m.capitalize() for m in metrics]
-                metrics.append(metrics[0])
-                scores.append(scores[0])
-                
                 # Plot the radar chart
-                angles = np.linspace(0, 2 * np.pi, len(metrics), endpoint=True)
-                ax.plot(angles, scores, 'o-', linewidth=2)
-                ax.fill(angles, scores, alpha=0.25)
-                ax.set_thetagrids(angles[:-1] * 180 / np.pi, metrics[:-1])
+                ax.plot(angles, closed_scores[i], 'o-', linewidth=2)
+                ax.fill(angles, closed_scores[i], alpha=0.25)
+                ax.set_thetagrids(deg_ticks, labels)
                 ax.set_ylim(0, self.scale_max)
                 ax.set_title(provider)
                 ax.grid(True)
@@ -500,8 +1108,9 @@ Example format:
         for j in range(i + 1, len(axes)):
             fig.delaxes(axes[j])
         
-        plt.tight_layout()
+        fig.tight_layout()
         
-        # Save plot
-        plt.savefig("radar_charts.png")
-        logger.info("Saved radar charts to radar_charts.png")
\ No newline at end of file
+        # Save plot and release the figure
+        fig.savefig("radar_charts.png")
+        plt.close(fig)
+        logger.info("Saved radar charts to radar_charts.png")
@@ -6,19 +6,261 @@ Creates comprehensive performance reports with visualizations to compare differe
 """
 
 import os
-import json
 import logging
+import re
+import html
 import argparse
+import functools
+from heapq import nsmallest
+from operator import itemgetter
 import numpy as np
+import jinja2
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from utils.helpers import json_loads
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Matplotlib's default color cycle, so the SVG chart matches the rendered plots
+_BAR_COLORS = [
+    "#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
+    "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf"
+]
+
+# Improvement suggestion for each metric a provider is weakest in
+_SUGGESTIONS = {
+    "accuracy": "Improve accuracy by enhancing feature extraction and ensuring all user preferences are captured correctly.",
+    "relevance": "Enhance relevance by better matching recommendations to user preferences and ensuring search queries target specific user interests.",
+    "completeness": "Make itineraries more complete by adding more details about attractions, timing, transportation between sites, and practical information.",
+    "usefulness": "Increase usefulness by adding local tips, off-the-beaten-path suggestions, and practical information about opening hours, tickets, and costs.",
+    "creativity": "Boost creativity by offering unique experiences, personalized recommendations, and themed itinerary options that go beyond standard tourist attractions."
+}
+
+# Compiled once at import and reused for every report
+_REPORT_TEMPLATE = jinja2.Template("""<!DOCTYPE html>
+<html>
+<head>
+    <title>Travel Planner LLM Evaluation Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        h1 { color: #2c3e50; }
+        h2 { color: #3498db; margin-top: 30px; }
+        table { border-collapse: collapse; width: 100%; margin: 20px 0; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: center; }
+        th { background-color: #3498db; color: white; }
+        tr:nth-child(even) { background-color: #f2f2f2; }
+        .metric-plots { display: flex; flex-wrap: wrap; justify-content: center; }
+        .metric-plot { margin: 10px; }
+        .suggestions { margin: 20px 0; }
+        .provider-suggestion { margin: 10px 0; padding: 10px; background-color: #f8f9fa; border-left: 4px solid #3498db; }
+    </style>
+</head>
+<body>
+    <h1>Travel Planner LLM Evaluation Report</h1>
+<h2>Overall Performance Summary</h2>
+<table border="1" class="dataframe summary-table">
+  <thead>
+    <tr style="text-align: right;">
+{% for column in columns %}
+      <th>{{ column|e }}</th>
+{% endfor %}
+    </tr>
+  </thead>
+  <tbody>
+{% for row in rows %}
+    <tr>
+{% for value in row %}
+      <td>{{ value|e if value is string else ("%.2f"|format(value) if value == value else "NaN") }}</td>
+{% endfor %}
+    </tr>
+{% endfor %}
+  </tbody>
+</table>
+
+<h2>Performance Heatmap</h2>
+<div style="text-align: center;">
+    <img src="heatmap.png" alt="Performance Heatmap" style="max-width: 100%;">
+</div>
+
+<h2>Performance by Query Category</h2>
+<div style="text-align: center;">
+{{ query_performance_svg }}
+</div>
+
+<h2>Metric Distribution</h2>
+<div class="metric-plots">
+{% for metric in metrics %}
+<div class="metric-plot"><img src="metric_plots/{{ metric }}_distribution.png" alt="{{ metric }} Distribution" style="width: 450px;"></div>
+{% endfor %}
+</div>
+
+<h2>Improvement Suggestions</h2>
+<div class="suggestions">
+{% for provider, provider_suggs in suggestions.items() %}
+    <div class="provider-suggestion"><h3>{{ provider }}</h3><ul>{% for suggestion in provider_suggs %}<li>{{ suggestion }}</li>{% endfor %}</ul></div>
+{% endfor %}
+</div>
+</body>
+</html>
+""", trim_blocks=True, lstrip_blocks=True, keep_trailing_newline=True)
+
+@functools.lru_cache(maxsize=None)
+def _plotting():
+    """
+    Import matplotlib and seaborn on first use.
+    
+    Both take a noticeable share of a second to import, so modules that only
+    need the report data (or the command-line help) don't pay for them.
+    
+    Returns:
+        Tuple of the matplotlib.pyplot and seaborn modules
+    """
+    import matplotlib
+    # Report plots are only written to files, so skip loading an interactive backend
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    return plt, sns
+
+def _render_heatmap(scores: np.ndarray, providers: List[str], metric_labels: List[str], output_file: str) -> None:
+    """
+    Render the provider x metric performance heatmap.
+    
+    Args:
+        scores: Scores with one row per provider and one column per metric
+        providers: Provider names, in row order
+        metric_labels: Metric labels, in column order
+        output_file: Path where the heatmap image will be saved
+    """
+    plt, sns = _plotting()
+    fig, ax = plt.subplots(figsize=(12, 8))
+    sns.heatmap(scores, xticklabels=metric_labels, yticklabels=providers,
+                annot=True, cmap="YlGnBu", fmt=".2f", linewidths=.5, ax=ax)
+    ax.set_xlabel("Metric")
+    ax.set_ylabel("Provider")
+    ax.set_title("LLM Provider Performance Across Metrics")
+    fig.tight_layout()
+    
+    # Save heatmap and release the figure
+    fig.savefig(output_file)
+    plt.close(fig)
+    logger.info(f"Saved heatmap to {output_file}")
+
+def _render_violins(plots: List[Tuple[str, pd.DataFrame, str]]) -> None:
+    """
+    Render the violin plot of each metric's scores across providers.
+    
+    A single figure is cleared and redrawn for every metric rather than
+    allocating a new figure per plot.
+    
+    Args:
+        plots: (metric, long-form frame with provider and score columns, output path) per metric
+    """
+    plt, sns = _plotting()
+    fig, ax = plt.subplots(figsize=(12, 6))
+    
+    for metric, scores, output_file in plots:
+        ax.clear()
+        
+        # Seaborn groups the long-form scores by provider itself
+        sns.violinplot(data=scores, x="provider", y="score", inner="quartile", cut=0, ax=ax)
+        ax.tick_params(axis="x", labelrotation=45)
+        ax.set_xlabel("")
+        ax.set_ylabel("Score")
+        ax.set_title(f"Distribution of {metric.capitalize()} Scores Across Providers")
+        ax.grid(axis='y', linestyle='--', alpha=0.7)
+        fig.tight_layout()
+        
+        fig.savefig(output_file)
+        logger.info(f"Saved {metric} distribution plot to {output_file}")
+    
+    plt.close(fig)
+
+def _svg_grouped_bars(avg_category_scores: pd.DataFrame) -> str:
+    """
+    Draw the grouped bar chart of average scores by query category as inline SVG.
+    
+    The chart is small enough that writing the shapes directly is much cheaper
+    than rasterizing it with matplotlib.
+    
+    Args:
+        avg_category_scores: Average scores with one row per category and one column per provider
+        
+    Returns:
+        SVG markup for the chart, ready to embed in the HTML report
+    """
+    categories = list(avg_category_scores.index)
+    providers = list(avg_category_scores.columns)
+    scores = avg_category_scores.to_numpy(dtype=float)
+    
+    # Plot area inside the margins, and a y axis in whole points covering every bar
+    width, height = 900, 450
+    left, right, top, bottom = 60, 200, 40, 50
+    plot_width = width - left - right
+    plot_height = height - top - bottom
+    y_max = max(10, int(np.ceil(scores.max()))) if scores.size else 10
+    
+    def y_pos(score: float) -> float:
+        return top + plot_height * (1 - score / y_max)
+    
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="Arial, sans-serif" font-size="12">',
+        f'<text x="{left + plot_width / 2}" y="20" text-anchor="middle" font-size="16">Performance by Query Category</text>'
+    ]
+    
+    # Dashed horizontal grid lines with y axis labels
+    for tick in range(0, y_max + 1, 2):
+        y = y_pos(tick)
+        parts.append(
+            f'<line x1="{left}" y1="{y:.1f}" x2="{left + plot_width}" y2="{y:.1f}" stroke="#ccc" stroke-dasharray="4 3"/>'
+            f'<text x="{left - 8}" y="{y + 4:.1f}" text-anchor="end">{tick}</text>'
+        )
+    
+    # One group of bars per category, one bar per provider
+    group_width = plot_width / max(len(categories), 1)
+    bar_width = 0.8 * group_width / max(len(providers), 1)
+    
+    for i, category in enumerate(categories):
+        group_left = left + i * group_width + 0.1 * group_width
+        for j, provider in enumerate(providers):
+            score = scores[i, j]
+            y = y_pos(score)
+            parts.append(
+                f'<rect x="{group_left + j * bar_width:.1f}" y="{y:.1f}" width="{bar_width:.1f}" '
+                f'height="{top + plot_height - y:.1f}" fill="{_BAR_COLORS[j % len(_BAR_COLORS)]}">'
+                f'<title>{html.escape(str(provider))}: {score:.2f}</title></rect>'
+            )
+        parts.append(
+            f'<text x="{left + (i + 0.5) * group_width:.1f}" y="{top + plot_height + 20}" '
+            f'text-anchor="middle">{html.escape(str(category))}</text>'
+        )
+    
+    # Axes and axis titles
+    parts.append(
+        f'<line x1="{left}" y1="{top}" x2="{left}" y2="{top + plot_height}" stroke="#333"/>'
+        f'<line x1="{left}" y1="{top + plot_height}" x2="{left + plot_width}" y2="{top + plot_height}" stroke="#333"/>'
+        f'<text x="{left + plot_width / 2}" y="{height - 10}" text-anchor="middle">Query Category</text>'
+        f'<text x="15" y="{top + plot_height / 2}" text-anchor="middle" '
+        f'transform="rotate(-90 15 {top + plot_height / 2})">Average Score</text>'
+    )
+    
+    # Legend
+    legend_x = left + plot_width + 20
+    parts.append(f'<text x="{legend_x}" y="{top + 5}" font-weight="bold">LLM Provider</text>')
+    for j, provider in enumerate(providers):
+        y = top + 20 + j * 20
+        parts.append(
+            f'<rect x="{legend_x}" y="{y}" width="12" height="12" fill="{_BAR_COLORS[j % len(_BAR_COLORS)]}"/>'
+            f'<text x="{legend_x + 18}" y="{y + 10}">{html.escape(str(provider))}</text>'
+        )
+    
+    parts.append('</svg>')
+    return "".join(parts)
+
 class EvaluationReportGenerator:
     """
     Generates detailed reports and visualizations from evaluation results.
@@ -28,6 +270,24 @@ class EvaluationReportGenerator:
     with metric analysis and improvement suggestions.
     """
     
+    # Query categories keyed by keyword; each branch only matches if its keywords occur
+    # anywhere in the query, and earlier categories win just like an if/elif chain
+    _CATEGORY_RE = re.compile(
+        r"^(?:"
+        r"(?=.*(?:museum|historical))(?P<Cultural>)"
+        r"|(?=.*(?:beach|snorkel|water))(?P<BeachWater>)"
+        r"|(?=.*(?:food|cuisine|restaurant))(?P<Food>)"
+        r"|(?=.*(?:hiking|mountain|nature))(?P<NatureOutdoors>)"
+        r")",
+        re.IGNORECASE | re.DOTALL
+    )
+    _GROUP_TO_CAT = {
+        "Cultural": "Cultural",
+        "BeachWater": "Beach/Water",
+        "Food": "Food",
+        "NatureOutdoors": "Nature/Outdoors"
+    }
+    
     def __init__(self, results_file: str):
         """
         Initialize the report generator.
@@ -48,6 +308,25 @@ class EvaluationReportGenerator:
             self.metrics = [m for m in first_provider.keys() if m != "overall"]
         else:
             self.metrics = []
+        
+        # Flatten every judge rating into one long table in a single pass over the
+        # nested results; "result" is the position of the evaluation in its provider's list
+        self._long = pd.DataFrame.from_records(
+            (
+                (provider, index, result.get("query") or "", metric, rating)
+                for provider, results in self.detailed_results.items()
+                for index, result in enumerate(results)
+                for metric, rating in result.get("evaluation", {}).get("ratings", {}).items()
+                if rating is not None
+            ),
+            columns=["provider", "result", "query", "metric", "score"]
+        ).astype({"score": "float32"})
+        
+        # Summary scores kept apart from their labels
+        self._summary_labels, self._summary_matrix, self._summary_metric_names = self._build_summary()
+        
+        # Output paths already rendered, so each plot is only drawn once
+        self._generated = set()
     
     def _load_results(self) -> Dict[str, Any]:
         """
@@ -58,8 +337,8 @@ class EvaluationReportGenerator:
             Returns empty dict if file cannot be loaded.
         """
         try:
-            with open(self.results_file, 'r') as f:
-                return json.load(f)
+            with open(self.results_file, 'rb') as f:
+                return json_loads(f.read())
         except Exception as e:
             logger.error(f"Error loading results: {str(e)}")
             return {}
@@ -75,28 +354,40 @@ class EvaluationReportGenerator:
             DataFrame with provider names and their scores for each metric.
             Returns empty DataFrame if no summary data is available.
         """
-        if not self.summary:
+        if not self._summary_labels.size:
             return pd.DataFrame()
         
-        # Create a list of dictionaries for the table
-        rows = []
+        # Wrap the numeric block only now; labels stay out of the score matrix
+        df = pd.DataFrame(self._summary_matrix, columns=self._summary_metric_names)
+        df.insert(0, "Provider", self._summary_labels)
         
-        for provider, metrics in self.summary.items():
-            row = {"Provider": provider}
-            row.update(metrics)
-            rows.append(row)
+        return df
+    
+    def _build_summary(self) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        Lay out the summary scores as one contiguous float64 matrix.
         
-        # Create DataFrame
-        df = pd.DataFrame(rows)
+        Returns:
+            Tuple of the provider labels, the (providers x metrics) score matrix with
+            NaN for missing scores, and the metric names with 'overall' at the end
+        """
+        providers = list(self.summary)
         
-        # Reorder columns to put 'overall' at the end
-        cols = ["Provider"] + [c for c in df.columns if c != "Provider" and c != "overall"]
-        if "overall" in df.columns:
+        # Metric columns in order of first appearance, with 'overall' at the end
+        cols = list(dict.fromkeys(
+            metric for metrics in self.summary.values() for metric in metrics if metric != "overall"
+        ))
+        if any("overall" in metrics for metrics in self.summary.values()):
             cols.append("overall")
         
-        df = df[cols]
+        # Fill one contiguous (providers x metrics) array; missing scores become NaN
+        values = np.fromiter(
+            (self.summary[provider].get(metric, np.nan) for provider in providers for metric in cols),
+            dtype=np.float64,
+            count=len(providers) * len(cols)
+        ).reshape(len(providers), len(cols))
         
-        return df
+        return np.array(providers, dtype=object), np.ascontiguousarray(values), cols
     
     def generate_heatmap(self, output_file: str = "heatmap.png") -> None:
         """
@@ -112,32 +403,34 @@ class EvaluationReportGenerator:
             logger.warning("No summary data available for heatmap")
             return
         
-        # Prepare data
-        data = []
+        if self._already_generated(output_file):
+            return
         
-        for provider, metrics in self.summary.items():
-            for metric, score in metrics.items():
-                if metric != "overall":  # Exclude overall from heatmap
-                    data.append({
-                        "Provider": provider,
-                        "Metric": metric.capitalize(),
-                        "Score": score
-                    })
+        _render_heatmap(*self._heatmap_data(), output_file)
+        self._generated.add(os.path.abspath(output_file))
+    
+    def _heatmap_data(self) -> Tuple[np.ndarray, List[str], List[str]]:
+        """
+        Lay out the summary scores as a dense matrix for the heatmap.
         
-        df = pd.DataFrame(data)
+        Rows and columns are sorted by provider and metric label, and metrics
+        a provider was not scored on are left as NaN.
         
-        # Create pivot table
-        pivot = df.pivot(index="Provider", columns="Metric", values="Score")
+        Returns:
+            Tuple of the (providers x metrics) score matrix, the provider names
+            and the metric labels
+        """
+        # Sort rows by provider and columns by metric label, excluding overall
+        row_order = np.argsort(self._summary_labels.astype(str), kind="stable")
+        metrics = sorted(
+            (metric for metric in self._summary_metric_names if metric != "overall"),
+            key=str.capitalize
+        )
+        col_order = [self._summary_metric_names.index(metric) for metric in metrics]
         
-        # Create heatmap
-        plt.figure(figsize=(12, 8))
-        sns.heatmap(pivot, annot=True, cmap="YlGnBu", fmt=".2f", linewidths=.5)
-        plt.title("LLM Provider Performance Across Metrics")
-        plt.tight_layout()
+        scores = self._summary_matrix[np.ix_(row_order, col_order)]
         
-        # Save heatmap
-        plt.savefig(output_file)
-        logger.info(f"Saved heatmap to {output_file}")
+        return scores, list(self._summary_labels[row_order]), [metric.capitalize() for metric in metrics]
     
     def generate_metric_distribution(self, output_dir: str = "metric_plots") -> None:
         """
@@ -153,151 +446,126 @@ class EvaluationReportGenerator:
             logger.warning("No detailed results available for distribution plots")
             return
         
+        if self._already_generated(output_dir):
+            return
+        
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
         
+        _render_violins(self._metric_distribution_plots(output_dir))
+        
+        self._generated.add(os.path.abspath(output_dir))
+    
+    def _metric_distribution_plots(self, output_dir: str) -> List[Tuple[str, pd.DataFrame, str]]:
+        """
+        Collect the data for every metric's distribution plot.
+        
+        Args:
+            output_dir: Directory where the distribution plots will be saved
+            
+        Returns:
+            List of (metric, long-form scores, output file) tuples, skipping
+            metrics without any scores
+        """
+        # Split the long ratings table by metric in one pass
+        scores_by_metric = {
+            metric: group[["provider", "score"]]
+            for metric, group in self._long.groupby("metric", sort=False)
+        }
+        
+        plots = []
+        
         # For each metric
         for metric in self.metrics:
-            # Collect scores for this metric from all providers and test cases
-            scores_by_provider = {}
-            
-            for provider, results in self.detailed_results.items():
-                scores = []
-                
-                for result in results:
-                    if "evaluation" in result and "ratings" in result["evaluation"]:
-                        rating = result["evaluation"]["ratings"].get(metric)
-                        if rating is not None:
-                            scores.append(rating)
-                
-                if scores:
-                    scores_by_provider[provider] = scores
+            # Scores for this metric from all providers and test cases
+            scores = scores_by_metric.get(metric)
             
-            if not scores_by_provider:
-                continue
-            
-            # Create violin plot
-            plt.figure(figsize=(12, 6))
-            
-            data = []
-            labels = []
-            
-            for provider, scores in scores_by_provider.items():
-                data.append(scores)
-                labels.append(provider)
-            
-            plt.violinplot(data, showmeans=True, showmedians=True)
-            plt.xticks(range(1, len(labels) + 1), labels, rotation=45)
-            plt.ylabel("Score")
-            plt.title(f"Distribution of {metric.capitalize()} Scores Across Providers")
-            plt.grid(axis='y', linestyle='--', alpha=0.7)
-            plt.tight_layout()
-            
-            # Save plot
-            output_file = os.path.join(output_dir, f"{metric}_distribution.png")
-            plt.savefig(output_file)
-            logger.info(f"Saved {metric} distribution plot to {output_file}")
+            if scores is not None:
+                plots.append((metric, scores, os.path.join(output_dir, f"{metric}_distribution.png")))
+        
+        return plots
     
-    def generate_performance_by_query(self, output_file: str = "query_performance.png") -> None:
+    def generate_performance_by_query(self) -> str:
         """
-        Generate a plot showing performance by query category.
+        Generate a chart showing performance by query category.
         
         Creates a grouped bar chart comparing how providers perform across different
         types of travel queries (Cultural, Beach/Water, Food, Nature/Outdoors, General).
+        The chart is emitted as inline SVG for embedding in the HTML report.
         
-        Args:
-            output_file: Path where the query performance plot will be saved
+        Returns:
+            SVG markup for the chart, or an empty string if there are no detailed results
         """
         if not self.detailed_results:
             logger.warning("No detailed results available for query performance plot")
-            return
-        
-        # Extract query features to categorize them
-        query_categories = {}
-        
-        for provider, results in self.detailed_results.items():
-            for result in results:
-                query = result.get("query", "")
-                
-                # Simple categorization based on keywords in the query
-                category = "General"
-                
-                if "museum" in query.lower() or "historical" in query.lower():
-                    category = "Cultural"
-                elif "beach" in query.lower() or "snorkel" in query.lower() or "water" in query.lower():
-                    category = "Beach/Water"
-                elif "food" in query.lower() or "cuisine" in query.lower() or "restaurant" in query.lower():
-                    category = "Food"
-                elif "hiking" in query.lower() or "mountain" in query.lower() or "nature" in query.lower():
-                    category = "Nature/Outdoors"
-                
-                # Store the category
-                if query not in query_categories:
-                    query_categories[query] = category
-        
-        # Collect overall scores by provider and category
-        category_scores = {}
-        
-        for provider, results in self.detailed_results.items():
-            for result in results:
-                query = result.get("query", "")
-                category = query_categories.get(query, "General")
-                
-                if "evaluation" in result and "ratings" in result["evaluation"]:
-                    # Calculate average score across all metrics
-                    ratings = result["evaluation"]["ratings"]
-                    avg_score = sum(ratings.values()) / len(ratings) if ratings else 0
-                    
-                    if category not in category_scores:
-                        category_scores[category] = {}
-                    
-                    if provider not in category_scores[category]:
-                        category_scores[category][provider] = []
-                    
-                    category_scores[category][provider].append(avg_score)
-        
-        # Calculate average scores by category and provider
-        avg_category_scores = {}
-        
-        for category, providers in category_scores.items():
-            avg_category_scores[category] = {}
-            
-            for provider, scores in providers.items():
-                avg_category_scores[category][provider] = sum(scores) / len(scores) if scores else 0
+            return ""
         
-        # Create grouped bar chart
-        plt.figure(figsize=(14, 8))
+        return _svg_grouped_bars(self._category_scores())
+    
+    def _category_scores(self) -> pd.DataFrame:
+        """
+        Average every provider's scores by query category.
         
-        # Get all categories and providers
-        categories = list(avg_category_scores.keys())
+        Returns:
+            DataFrame with one row per query category and one column per provider
+        """
         providers = list(self.detailed_results.keys())
         
-        # Set width of bars
-        width = 0.8 / len(providers)
-        x = np.arange(len(categories))
+        if self._long.empty:
+            return pd.DataFrame(index=[], columns=providers, dtype=float)
+        
+        # Average score across all metrics of each evaluation
+        per_result = self._long.groupby(["provider", "result"], sort=False).agg(
+            query=("query", "first"),
+            score=("score", "mean")
+        )
+        
+        # Simple categorization based on keywords in the query, once per distinct query
+        queries = per_result["query"].unique()
+        per_result["category"] = per_result["query"].map(
+            dict(zip(queries, map(self._categorize_query, queries)))
+        )
+        
+        # Average scores by category (in order of first appearance) and provider
+        categories = per_result["category"].unique()
+        avg_category_scores = (
+            per_result.groupby(["category", "provider"])["score"].mean()
+            .unstack("provider")
+            .reindex(index=categories, columns=providers)
+            .fillna(0.0)
+            .astype(float)
+        )
+        
+        return avg_category_scores
+    
+    @classmethod
+    def _categorize_query(cls, query: str) -> str:
+        """
+        Assign a travel query to a category based on its keywords.
         
-        # Plot bars for each provider
-        for i, provider in enumerate(providers):
-            scores = []
-            
-            for category in categories:
-                score = avg_category_scores.get(category, {}).get(provider, 0)
-                scores.append(score)
+        Args:
+            query: The user query
             
-            offset = i * width - (len(providers) - 1) * width / 2
-            plt.bar(x + offset, scores, width, label=provider)
-        
-        plt.xlabel("Query Category")
-        plt.ylabel("Average Score")
-        plt.title("Performance by Query Category")
-        plt.xticks(x, categories)
-        plt.legend(title="LLM Provider")
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        plt.tight_layout()
+        Returns:
+            The query category, or "General" if no keywords match
+        """
+        match = cls._CATEGORY_RE.match(query)
+        return cls._GROUP_TO_CAT[match.lastgroup] if match else "General"
+    
+    def _already_generated(self, output_path: str) -> bool:
+        """
+        Check whether a plot or plot directory has already been rendered.
         
-        # Save plot
-        plt.savefig(output_file)
-        logger.info(f"Saved query performance plot to {output_file}")
+        Args:
+            output_path: Path of the plot file or directory
+            
+        Returns:
+            True if the output was already rendered by this generator
+        """
+        if os.path.abspath(output_path) in self._generated:
+            logger.info(f"Reusing previously generated {output_path}")
+            return True
+        return False
     
     def generate_improvement_suggestions(self) -> Dict[str, List[str]]:
         """
@@ -319,35 +587,12 @@ class EvaluationReportGenerator:
         for provider, metrics in self.summary.items():
             # Find the weakest metrics (excluding overall)
             metric_scores = {m: s for m, s in metrics.items() if m != "overall"}
-            sorted_metrics = sorted(metric_scores.items(), key=lambda x: x[1])
             
-            # Get the 2 weakest metrics
-            weak_metrics = sorted_metrics[:2] if len(sorted_metrics) >= 2 else sorted_metrics
+            # Get the 2 weakest metrics without sorting all of them
+            weak_metrics = nsmallest(2, metric_scores.items(), key=itemgetter(1))
             
             # Generate suggestions
-            provider_suggestions = []
-            
-            for metric, _ in weak_metrics:
-                if metric == "accuracy":
-                    provider_suggestions.append(
-                        "Improve accuracy by enhancing feature extraction and ensuring all user preferences are captured correctly."
-                    )
-                elif metric == "relevance":
-                    provider_suggestions.append(
-                        "Enhance relevance by better matching recommendations to user preferences and ensuring search queries target specific user interests."
-                    )
-                elif metric == "completeness":
-                    provider_suggestions.append(
-                        "Make itineraries more complete by adding more details about attractions, timing, transportation between sites, and practical information."
-                    )
-                elif metric == "usefulness":
-                    provider_suggestions.append(
-                        "Increase usefulness by adding local tips, off-the-beaten-path suggestions, and practical information about opening hours, tickets, and costs."
-                    )
-                elif metric == "creativity":
-                    provider_suggestions.append(
-                        "Boost creativity by offering unique experiences, personalized recommendations, and themed itinerary options that go beyond standard tourist attractions."
-                    )
+            provider_suggestions = [_SUGGESTIONS[metric] for metric, _ in weak_metrics if metric in _SUGGESTIONS]
             
             suggestions[provider] = provider_suggestions
         
@@ -359,80 +604,29 @@ class EvaluationReportGenerator:
         
         Creates an HTML page that includes the summary table, heatmap,
         performance by query category plot, metric distribution plots,
-        and improvement suggestions for each provider.
+        and improvement suggestions for each provider. The plots are written
+        next to the HTML file; any already rendered there are reused.
         
         Args:
             output_file: Path where the HTML report will be saved
         """
+        report_dir = os.path.dirname(output_file)
+        
         # Generate all the components
         summary_df = self.generate_summary_table()
-        self.generate_heatmap("heatmap.png")
-        self.generate_metric_distribution("metric_plots")
-        self.generate_performance_by_query("query_performance.png")
+        self.generate_heatmap(os.path.join(report_dir, "heatmap.png"))
+        self.generate_metric_distribution(os.path.join(report_dir, "metric_plots"))
+        query_performance_svg = self.generate_performance_by_query()
         suggestions = self.generate_improvement_suggestions()
         
-        # Create HTML content
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Travel Planner LLM Evaluation Report</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                h1 {{ color: #2c3e50; }}
-                h2 {{ color: #3498db; margin-top: 30px; }}
-                table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: center; }}
-                th {{ background-color: #3498db; color: white; }}
-                tr:nth-child(even) {{ background-color: #f2f2f2; }}
-                .metric-plots {{ display: flex; flex-wrap: wrap; justify-content: center; }}
-                .metric-plot {{ margin: 10px; }}
-                .suggestions {{ margin: 20px 0; }}
-                .provider-suggestion {{ margin: 10px 0; padding: 10px; background-color: #f8f9fa; border-left: 4px solid #3498db; }}
-            </style>
-        </head>
-        <body>
-            <h1>Travel Planner LLM Evaluation Report</h1>
-            
-            <h2>Overall Performance Summary</h2>
-            <table>
-                <tr>
-                    {"".join([f"<th>{col}</th>" for col in summary_df.columns])}
-                </tr>
-                {"".join([
-                    f"<tr>{''.join([f'<td>{row[col]:.2f}</td>' if isinstance(row[col], float) else f'<td>{row[col]}</td>' for col in summary_df.columns])}</tr>"
-                    for _, row in summary_df.iterrows()
-                ])}
-            </table>
-            
-            <h2>Performance Heatmap</h2>
-            <div style="text-align: center;">
-                <img src="heatmap.png" alt="Performance Heatmap" style="max-width: 100%;">
-            </div>
-            
-            <h2>Performance by Query Category</h2>
-            <div style="text-align: center;">
-                <img src="query_performance.png" alt="Performance by Query Category" style="max-width: 100%;">
-            </div>
-            
-            <h2>Metric Distribution</h2>
-            <div class="metric-plots">
-                {"".join([
-                    f'<div class="metric-plot"><img src="metric_plots/{metric}_distribution.png" alt="{metric} Distribution" style="width: 450px;"></div>'
-                    for metric in self.metrics
-                ])}
-            </div>
-            
-            <h2>Improvement Suggestions</h2>
-            <div class="suggestions">
-                {"".join([
-                    f'<div class="provider-suggestion"><h3>{provider}</h3><ul>{"".join([f"<li>{suggestion}</li>" for suggestion in provider_suggs])}</ul></div>'
-                    for provider, provider_suggs in suggestions.items()
-                ])}
-            </div>
-        </body>
-        </html>
-        """
+        # Render the whole page in one pass of the compiled template
+        html_content = _REPORT_TEMPLATE.render(
+            columns=list(summary_df.columns),
+            rows=summary_df.itertuples(index=False),
+            query_performance_svg=query_performance_svg,
+            metrics=self.metrics,
+            suggestions=suggestions
+        )
         
         # Write HTML to file
         with open(output_file, 'w') as f:
@@ -457,14 +651,34 @@ class EvaluationReportGenerator:
         # Generate components with paths in the output directory
         heatmap_path = os.path.join(output_dir, "heatmap.png")
         metric_plots_dir = os.path.join(output_dir, "metric_plots")
-        query_performance_path = os.path.join(output_dir, "query_performance.png")
         html_report_path = os.path.join(output_dir, "index.html")
         
-        # Generate all plots and reports
-        self.generate_heatmap(heatmap_path)
-        self.generate_metric_distribution(metric_plots_dir)
-        self.generate_performance_by_query(query_performance_path)
-        self.generate_html_report(html_report_path)
+        # Prepare every plot's data up front so the figures can render independently
+        render_jobs = []
+        rendered_paths = []
+        
+        if self.summary:
+            render_jobs.append((_render_heatmap, (*self._heatmap_data(), heatmap_path)))
+            rendered_paths.append(heatmap_path)
+        
+        if self.detailed_results:
+            # Spread the violins over the workers the heatmap leaves free; each worker
+            # still reuses one figure for its share of the metrics
+            plots = self._metric_distribution_plots(metric_plots_dir)
+            n_chunks = min(len(plots), max(1, (os.cpu_count() or 1) - len(render_jobs)))
+            render_jobs.extend((_render_violins, (plots[i::n_chunks],)) for i in range(n_chunks))
+            rendered_paths.append(metric_plots_dir)
+        
+        # Rasterizing is CPU-bound and each figure is independent, so render them in parallel
+        with ProcessPoolExecutor(max_workers=min(len(render_jobs), os.cpu_count() or 1) or 1) as executor:
+            futures = [executor.submit(render, *args) for render, args in render_jobs]
+            
+            # The HTML only links to the plot files, so build and write it while they render
+            self._generated.update(os.path.abspath(path) for path in rendered_paths)
+            self.generate_html_report(html_report_path)
+            
+            for future in futures:
+                future.result()
         
         logger.info(f"Generated full evaluation report in {output_dir}")
 
@@ -8,7 +8,12 @@ and provides both CLI and web interface for the travel planning agent.
 import yaml
 import argparse
 from dotenv import load_dotenv
-from app.agent import TravelPlannerAgent
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 def load_config(config_path: str):
     """
@@ -20,8 +25,9 @@ def load_config(config_path: str):
     Returns:
         dict: Parsed configuration dictionary
     """
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+    # Binary mode lets libyaml read the raw bytes without a Python-side decode
+    with open(config_path, 'rb') as f:
+        return yaml.load(f, Loader=_YamlLoader)
 
 def main():
     """
@@ -42,6 +48,9 @@ def main():
     
     if args.cli:
         # Run in CLI mode (same as before)
+        # Imported here so --help and the web app don't load the agent stack
+        from app.agent import TravelPlannerAgent
+        
         # Initialize agent
         agent = TravelPlannerAgent(config)
         
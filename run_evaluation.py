@@ -6,15 +6,35 @@ It handles test data loading, evaluation execution, result analysis, and compreh
 """
 
 import os
-import json
 import yaml
 import logging
 import argparse
+import random
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Tuple
 from dotenv import load_dotenv
 from evaluator import TravelAgentEvaluator
 from generate_report import EvaluationReportGenerator
+from utils.helpers import json_loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 # Set up logging
 logging.basicConfig(
@@ -23,6 +43,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Base directories already created by this process, so later runs only need one mkdir
+_ready_base_dirs = set()
+
+# Parsed configs keyed by (path, modification time), so unchanged files are parsed once
+_config_cache = {}
+
 def load_config(config_path: str) -> dict:
     """
     Load configuration from a YAML file.
@@ -36,11 +62,103 @@ def load_config(config_path: str) -> dict:
     -------
     dict
         Dictionary containing configuration settings for the evaluation pipeline
+        
+    Notes
+    -----
+    Results are cached per file modification time; editing the file invalidates
+    the cached entry. The returned dict is shared between calls, so callers should
+    copy it before modifying it.
+    """
+    key = (config_path, os.stat(config_path).st_mtime_ns)
+    config = _config_cache.get(key)
+    if config is None:
+        with open(config_path, 'rb') as f:
+            config = yaml.load(f, Loader=_YamlLoader)
+        _config_cache[key] = config
+    
+    return config
+
+def iter_test_cases(data_path: str) -> Iterator[str]:
+    """
+    Lazily yield test cases from a JSON test data file.
+    
+    Parameters
+    ----------
+    data_path : str
+        Path to the JSON file containing test data
+        
+    Yields
+    ------
+    str
+        The query of each record that has an 'input_query' field
+        
+    Notes
+    -----
+    With ijson installed the file is streamed record by record, so it is never
+    held in memory as a whole. Otherwise it is parsed in one go, with simdjson's
+    lazy proxies when available (only input_query is decoded from each record)
+    and orjson or the standard library otherwise.
+    """
+    if ijson is not None:
+        with open(data_path, 'rb') as f:
+            for item in ijson.items(f, 'item'):
+                if isinstance(item, dict) and "input_query" in item:
+                    yield item["input_query"]
+        return
+    
+    with open(data_path, 'rb') as f:
+        raw = f.read()
+    
+    if simdjson is not None:
+        parser = simdjson.Parser()
+        data = parser.parse(raw)
+        if isinstance(data, simdjson.Array):
+            for item in data:
+                if isinstance(item, simdjson.Object) and "input_query" in item:
+                    yield item["input_query"]
+    else:
+        # orjson parses straight from the raw bytes when it is installed
+        data = json_loads(raw)
+        if isinstance(data, list):
+            for item in data:
+                if isinstance(item, dict) and "input_query" in item:
+                    yield item["input_query"]
+
+def _reservoir_sample(items: Iterable[str], sample_size: int, seed: int) -> Tuple[List[str], int]:
+    """
+    Uniformly sample items from a stream of unknown length (Algorithm R).
+    
+    Parameters
+    ----------
+    items : Iterable[str]
+        Items to sample from; consumed once
+    sample_size : int
+        Number of items to keep
+    seed : int
+        Seed for the random number generator
+        
+    Returns
+    -------
+    Tuple[List[str], int]
+        The sampled items (all items, in order, if there are no more than
+        sample_size) and the total number of items seen
     """
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+    rng = random.Random(seed)
+    reservoir = []
+    count = 0
+    
+    for count, item in enumerate(items, 1):
+        if count <= sample_size:
+            reservoir.append(item)
+        else:
+            # Keep the new item with probability sample_size / count
+            slot = rng.randrange(count)
+            if slot < sample_size:
+                reservoir[slot] = item
+    
+    return reservoir, count
 
-def load_test_data(data_path: str, sample_size: int = None) -> list:
+def load_test_data(data_path: str, sample_size: int = None) -> List[str]:
     """
     Load test data from a JSON file and extract test cases.
     
@@ -53,36 +171,25 @@ def load_test_data(data_path: str, sample_size: int = None) -> list:
         
     Returns
     -------
-    list
-        List of dictionaries containing test cases with 'query' keys
+    List[str]
+        Test case queries, as accepted by TravelAgentEvaluator.evaluate_llm_providers
         
     Notes
     -----
     The function expects a JSON file with a list of dictionaries,
-    each containing an 'input_query' field.
+    each containing an 'input_query' field. When sampling, test cases are
+    reservoir-sampled as they are read, so only the sample is kept in memory.
     """
     try:
-        with open(data_path, 'r') as f:
-            data = json.load(f)
-        
-        # Extract test cases
-        test_cases = []
-        if isinstance(data, list):
-            for item in data:
-                if isinstance(item, dict) and "input_query" in item:
-                    test_cases.append({
-                        "query": item["input_query"]
-                    })
+        if sample_size and sample_size > 0:
+            test_cases, total = _reservoir_sample(iter_test_cases(data_path), sample_size, seed=42)
+            logger.info(f"Loaded {total} test cases from {data_path}")
+            if sample_size < total:
+                logger.info(f"Sampled {len(test_cases)} test cases")
+            return test_cases
         
+        test_cases = list(iter_test_cases(data_path))
         logger.info(f"Loaded {len(test_cases)} test cases from {data_path}")
-        
-        # Apply sampling if specified
-        if sample_size and 0 < sample_size < len(test_cases):
-            import random
-            random.seed(42)  # For reproducibility
-            test_cases = random.sample(test_cases, sample_size)
-            logger.info(f"Sampled {len(test_cases)} test cases")
-        
         return test_cases
         
     except Exception as e:
@@ -109,7 +216,20 @@ def create_run_directory(base_dir: str = "evaluation_runs") -> str:
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     run_dir = os.path.join(base_dir, f"run_{timestamp}")
-    os.makedirs(run_dir, exist_ok=True)
+    
+    if base_dir not in _ready_base_dirs:
+        os.makedirs(base_dir, exist_ok=True)
+        _ready_base_dirs.add(base_dir)
+    
+    try:
+        os.mkdir(run_dir)
+    except FileExistsError:
+        # Another run started within the same second; share its directory as before
+        pass
+    except FileNotFoundError:
+        # The base directory was removed since it was first created
+        os.makedirs(run_dir, exist_ok=True)
+    
     logger.info(f"Created run directory: {run_dir}")
     return run_dir
 
@@ -140,6 +260,9 @@ def main():
         Skip evaluation and use existing results file
     --results-file : str, optional
         Path to existing results file (required if --skip-evaluation is used)
+    --max-concurrency : int, optional
+        Maximum number of agent and judge calls in flight at once (at least 1),
+        overriding the ``evaluation.max_concurrency`` config setting
     """
     # Load environment variables
     load_dotenv()
@@ -152,24 +275,38 @@ def main():
     parser.add_argument('--output-dir', type=str, default='evaluation_runs', help='Base directory for evaluation outputs')
     parser.add_argument('--skip-evaluation', action='store_true', help='Skip evaluation and use existing results file')
     parser.add_argument('--results-file', type=str, help='Path to existing results file (if skipping evaluation)')
+    parser.add_argument('--max-concurrency', type=int, help='Maximum number of agent and judge calls in flight at once (overrides config)')
     args = parser.parse_args()
     
-    # Create run directory
-    run_dir = create_run_directory(args.output_dir)
+    if args.max_concurrency is not None and args.max_concurrency < 1:
+        parser.error("--max-concurrency must be at least 1")
+    
+    # Create the run directory while the configuration and test data load; the
+    # three are independent I/O and the parsers run in C
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        run_dir_future = executor.submit(create_run_directory, args.output_dir)
+        config_future = executor.submit(load_config, args.config)
+        test_cases_future = None if args.skip_evaluation else executor.submit(load_test_data, args.data, args.sample_size)
+        
+        run_dir = run_dir_future.result()
+        config = config_future.result()
+        test_cases = test_cases_future.result() if test_cases_future else None
     
     # Path for evaluation results
     results_file = os.path.join(run_dir, "evaluation_results.json")
     
-    # Load configuration
-    config = load_config(args.config)
+    # The loaded config is cached, so override settings on a copy. The JSONL
+    # log is kept with the rest of this run's outputs.
+    evaluation_config = config.get("evaluation", {})
+    log_file = os.path.join(run_dir, os.path.basename(evaluation_config.get("log_file", "eval_log.jsonl")))
+    config = {**config, "evaluation": {**evaluation_config, "log_file": log_file}}
+    if args.max_concurrency is not None:
+        config = {**config, "evaluation": {**config.get("evaluation", {}), "max_concurrency": args.max_concurrency}}
     
     # Run evaluation or use existing results
     if not args.skip_evaluation:
         logger.info("Starting evaluation...")
         
-        # Load test data
-        test_cases = load_test_data(args.data, args.sample_size)
-        
         if not test_cases:
             logger.error("No test cases available. Exiting.")
             return
@@ -203,7 +340,7 @@ def main():
     # Generate summary report
     summary_df = report_generator.generate_summary_table()
     summary_file = os.path.join(run_dir, "summary.csv")
-    summary_df.to_csv(summary_file, index=False)
+    summary_df.to_csv(summary_file, index=False, lineterminator="\n")
     
     # Print summary to console
     logger.info("\n" + "-" * 50)
@@ -211,15 +348,19 @@ def main():
     logger.info("-" * 50)
     
     if not summary_df.empty:
-        # Format summary for display
-        pd.set_option('display.max_columns', None)
-        pd.set_option('display.width', 120)
-        logger.info("\n" + str(summary_df))
+        # Format summary for display, with one formatter per score column. The display
+        # options only apply inside the block, so pandas' global settings stay untouched
+        float_cols = summary_df.select_dtypes("float").columns
+        with pd.option_context('display.max_columns', None, 'display.width', 120):
+            logger.info("\n" + summary_df.to_string(formatters={col: "{:.3f}".format for col in float_cols}))
         
         # Find best overall provider
         if "overall" in summary_df.columns:
-            best_provider = summary_df.loc[summary_df["overall"].idxmax()]["Provider"]
-            best_score = summary_df["overall"].max()
+            # One scan finds both the best provider and its score, skipping missing scores like idxmax
+            overall = summary_df["overall"].to_numpy()
+            best_index = int(np.nanargmax(overall))
+            best_provider = summary_df["Provider"].iloc[best_index]
+            best_score = float(overall[best_index])
             logger.info(f"\nBest performing provider: {best_provider} (Overall score: {best_score:.2f})")
     
     logger.info("\nDetailed report available at:")
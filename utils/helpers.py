@@ -7,7 +7,39 @@ These helpers support the travel planner application with common data manipulati
 import re
 import json
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Patterns compiled once at import rather than looked up in re's cache on every call
+_DATE_RE = re.compile(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b|\b\w+\s+\d{1,2},\s+\d{4}\b|\b\d{1,2}\s+\w+\s+\d{4}\b')
+_DATE_RANGE_SEP_RE = re.compile(r'\s+(?:to|-|–|through|til|until)\s+')
+
+# One token per alternative, so an itinerary is converted in a single scan
+_ITINERARY_TOKEN_RE = re.compile(
+    r'(?P<day>Day \d+:[^\n]*?)\n'
+    r'|(?P<hashes>#+)[^\S\n]+(?P<heading>[^\n]*?)\n'
+    r'|- (?P<item>[^\n]*?)\n'
+    r'|(?P<newline>\n)'
+)
+
+# Each supported date shape gets a named group; the matching group selects the
+# strptime formats worth trying, in priority order
+_DATE_SHAPE_RE = re.compile(
+    r'(?P<iso>\d{4}-\d{1,2}-\d{1,2})'
+    r'|(?P<numeric>\d{1,2}/\d{1,2}/\d{4})'
+    r'|(?P<month_first>[^\W\d_]+\s+\d{1,2},\s+\d{4})'
+    r'|(?P<day_first>\d{1,2}\s+[^\W\d_]+\s+\d{4})'
+)
+_DATE_FORMATS = {
+    "iso": ("%Y-%m-%d",),
+    "numeric": ("%m/%d/%Y", "%d/%m/%Y"),
+    "month_first": ("%B %d, %Y", "%b %d, %Y"),
+    "day_first": ("%d %B %Y", "%d %b %Y")
+}
 
 def parse_date_string(date_str: str) -> Optional[datetime]:
     """
@@ -19,19 +51,16 @@ def parse_date_string(date_str: str) -> Optional[datetime]:
     Returns:
         Optional[datetime]: A datetime object if parsing succeeds, None otherwise
     """
-    date_formats = [
-        "%Y-%m-%d",
-        "%m/%d/%Y",
-        "%d/%m/%Y",
-        "%B %d, %Y",
-        "%d %B %Y",
-        "%b %d, %Y",
-        "%d %b %Y"
-    ]
-    
-    for fmt in date_formats:
+    date_str = date_str.strip()
+    
+    # Only the formats matching the string's shape are tried
+    match = _DATE_SHAPE_RE.fullmatch(date_str)
+    if not match:
+        return None
+    
+    for fmt in _DATE_FORMATS[match.lastgroup]:
         try:
-            return datetime.strptime(date_str.strip(), fmt)
+            return datetime.strptime(date_str, fmt)
         except ValueError:
             continue
     
@@ -57,17 +86,11 @@ def extract_date_range(dates_str: str) -> Dict[str, datetime]:
     }
     
     # Try to split by common separators
-    separators = [" to ", " - ", " – ", " through ", " til ", " until "]
-    date_parts = []
+    date_parts = _DATE_RANGE_SEP_RE.split(dates_str, maxsplit=1)
     
-    for sep in separators:
-        if sep in dates_str:
-            date_parts = dates_str.split(sep, 1)
-            break
-    
-    if not date_parts:
+    if len(date_parts) == 1:
         # Try to find dates using regex
-        date_matches = re.findall(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b|\b\w+\s+\d{1,2},\s+\d{4}\b|\b\d{1,2}\s+\w+\s+\d{4}\b', dates_str)
+        date_matches = _DATE_RE.findall(dates_str)
         date_parts = date_matches if len(date_matches) <= 2 else date_matches[:2]
     
     if len(date_parts) >= 1:
@@ -91,18 +114,29 @@ def format_itinerary_as_html(itinerary: str) -> str:
     Returns:
         str: HTML-formatted version of the itinerary
     """
-    # Replace newlines with <br>
-    html = itinerary.replace('\n', '<br>')
-    
-    # Make headings
-    html = re.sub(r'(Day \d+:.*?)(<br>)', r'<h3>\1</h3>', html)
-    html = re.sub(r'(#+)\s+(.*?)(<br>)', lambda m: f'<h{len(m.group(1))}>{m.group(2)}</h{len(m.group(1))}>', html)
-    
-    # Format lists
-    html = re.sub(r'- (.*?)(<br>)', r'<li>\1</li>', html)
-    html = html.replace('<li>', '<ul><li>').replace('</li><br><li>', '</li><li>').replace('</li><br></ul>', '</li></ul>')
+    return _ITINERARY_TOKEN_RE.sub(_format_itinerary_token, itinerary)
+
+def _format_itinerary_token(match: re.Match) -> str:
+    """
+    Convert one itinerary token matched by _ITINERARY_TOKEN_RE to HTML.
     
-    return html
+    Args:
+        match (re.Match): The day heading, markdown heading, list item or newline
+        
+    Returns:
+        str: The HTML for the token
+    """
+    kind = match.lastgroup
+    
+    # Headings and list items consume the newline that ends their line
+    if kind == "day":
+        return f"<h3>{match.group('day')}</h3>"
+    if kind == "heading":
+        level = len(match.group("hashes"))
+        return f"<h{level}>{match.group('heading')}</h{level}>"
+    if kind == "item":
+        return f"<ul><li>{match.group('item')}</li>"
+    return "<br>"
 
 def safe_json_loads(json_str: str, default_value: Any = None) -> Any:
     """
@@ -117,8 +151,9 @@ def safe_json_loads(json_str: str, default_value: Any = None) -> Any:
         Any: Parsed JSON object or default value on failure
     """
     try:
-        return json.loads(json_str)
+        return json_loads(json_str)
     except json.JSONDecodeError:
+        # orjson.JSONDecodeError subclasses this, so both parsers' errors land here
         return default_value if default_value is not None else {}
     
 def set_to_list_converter(obj):
@@ -139,4 +174,66 @@ def set_to_list_converter(obj):
     """
     if isinstance(obj, set):
         return list(obj)
-    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
\ No newline at end of file
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def json_dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Serialize an object to a JSON string, using orjson when it is installed.
+    
+    Sets are converted to lists and non-string dict keys are stringified, matching
+    json.dumps with set_to_list_converter as the default.
+    
+    Args:
+        obj (Any): Object to serialize
+        indent (bool, optional): Pretty-print with a two-space indent. Defaults to False.
+        
+    Returns:
+        str: JSON representation of the object
+    """
+    if orjson is not None:
+        return json_dumpb(obj, indent).decode()
+    
+    return json.dumps(obj, indent=2 if indent else None, default=set_to_list_converter)
+
+def json_dumpb(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON, using orjson when it is installed.
+    
+    Behaves like json_dumps but returns bytes, so files can be written in binary
+    mode without a decode/encode round trip. With orjson, numpy arrays and scalars
+    are serialized natively.
+    
+    Args:
+        obj (Any): Object to serialize
+        indent (bool, optional): Pretty-print with a two-space indent. Defaults to False.
+        
+    Returns:
+        bytes: UTF-8 encoded JSON representation of the object
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        # Sets are rare in these payloads, so converting them in the default callback is
+        # cheaper than a Python pre-pass that rebuilds every container to strip them
+        return orjson.dumps(obj, default=set_to_list_converter, option=option)
+    
+    return json.dumps(obj, indent=2 if indent else None, default=set_to_list_converter).encode()
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document, using orjson when it is installed.
+    
+    Args:
+        data (Union[str, bytes]): JSON text or UTF-8 encoded bytes
+        
+    Returns:
+        Any: The parsed JSON value
+        
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    
+    return json.loads(data)